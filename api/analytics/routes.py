@@ -1,11 +1,14 @@
 """Analytics API routes."""
 
+from functools import wraps
 from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from packages.db.session import get_async_db
+from api.responses import conditional_json_response, stream_json_list
 from .service import AnalyticsService
 from .models import (
     FarmerDashboardStats,
@@ -22,105 +25,100 @@ from .models import (
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 
+def _server_error(detail: str):
+    """Translate unexpected errors raised by a route into a 500 with the given detail."""
+    def decorator(endpoint):
+        @wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            except Exception:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=detail
+                )
+        return wrapper
+    return decorator
+
+
 @router.get("/farmer/dashboard", response_model=FarmerDashboardStats)
+@_server_error("Failed to fetch farmer dashboard stats")
 async def get_farmer_dashboard_stats(
+    request: Request,
     farmer_id: Optional[UUID] = Query(None, description="Farmer ID for stats"),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get dashboard statistics for farmer portal."""
-    try:
-        stats = await AnalyticsService.get_farmer_dashboard_stats(db, farmer_id)
-        return stats
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch farmer dashboard stats"
-        )
+    body = await AnalyticsService.get_farmer_dashboard_stats(db, farmer_id)
+    return conditional_json_response(request, body)
 
 
 @router.get("/customer/stats", response_model=CustomerStats)
+@_server_error("Failed to fetch customer stats")
 async def get_customer_stats(
+    request: Request,
     customer_id: Optional[UUID] = Query(None, description="Customer ID for stats"),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get customer account statistics."""
-    try:
-        stats = await AnalyticsService.get_customer_stats(db, customer_id)
-        return stats
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch customer stats"
-        )
+    stats = await AnalyticsService.get_customer_stats(db, customer_id)
+    return conditional_json_response(request, stats.model_dump())
 
 
 @router.get("/orders", response_model=OrderAnalytics)
+@_server_error("Failed to fetch order analytics")
 async def get_order_analytics(
+    request: Request,
     farmer_id: Optional[UUID] = Query(None, description="Farmer ID for filtering"),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get order analytics data."""
-    try:
-        analytics = await AnalyticsService.get_order_analytics(db, farmer_id)
-        return analytics
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch order analytics"
-        )
+    body = await AnalyticsService.get_order_analytics(db, farmer_id)
+    return conditional_json_response(request, body)
 
 
 @router.get("/farmer/{farmer_id}/order-stats", response_model=OrderStatusStats)
+@_server_error("Failed to fetch farmer order stats")
 async def get_farmer_order_stats(
+    request: Request,
     farmer_id: UUID,
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get farmer order statistics by status."""
-    try:
-        stats = await AnalyticsService.get_farmer_order_stats(db, farmer_id)
-        return stats
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch farmer order stats"
-        )
+    stats = await AnalyticsService.get_farmer_order_stats(db, farmer_id)
+    return conditional_json_response(request, stats.model_dump())
 
 
 @router.get("/customer/{customer_id}/activity", response_model=CustomerActivity)
+@_server_error("Failed to fetch customer activity")
 async def get_customer_recent_activity(
+    request: Request,
     customer_id: UUID,
     limit: int = Query(10, ge=1, le=50, description="Number of activities to return"),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get recent customer account activity."""
-    try:
-        activities = await AnalyticsService.get_customer_recent_activity(db, customer_id, limit)
-        return CustomerActivity(activities=activities)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch customer activity"
-        )
+    activities = await AnalyticsService.get_customer_recent_activity(db, customer_id, limit)
+    return conditional_json_response(request, CustomerActivity.model_construct(activities=activities).model_dump())
 
 
 @router.get("/farmer/{farmer_id}/customers", response_model=FarmerCustomersList)
+@_server_error("Failed to fetch farmer customers")
 async def get_farmer_customers(
     farmer_id: UUID,
     limit: int = Query(50, ge=1, le=100, description="Number of customers to return"),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get customers who have ordered from a specific farmer."""
-    try:
-        customers, total = await AnalyticsService.get_farmer_customers(db, farmer_id, limit)
-        return FarmerCustomersList(customers=customers, total=total)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch farmer customers"
-        )
+    customers = await AnalyticsService.get_farmer_customers(db, farmer_id, limit)
+    return StreamingResponse(
+        stream_json_list("customers", customers),
+        media_type="application/json"
+    )
 
 
 @router.get("/farmer/{farmer_id}/shipments", response_model=ShipmentsList)
+@_server_error("Failed to fetch farmer shipments")
 async def get_farmer_shipments(
     farmer_id: UUID,
     status: Optional[str] = Query(None, description="Filter by shipment status"),
@@ -128,43 +126,32 @@ async def get_farmer_shipments(
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get shipments for a farmer's orders."""
-    try:
-        shipments, total = await AnalyticsService.get_farmer_shipments(db, farmer_id, status, limit)
-        return ShipmentsList(shipments=shipments, total=total)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch farmer shipments"
-        )
+    shipments = await AnalyticsService.get_farmer_shipments(db, farmer_id, status, limit)
+    return StreamingResponse(
+        stream_json_list("shipments", shipments),
+        media_type="application/json"
+    )
 
 
 @router.get("/inventory", response_model=InventoryMetrics)
+@_server_error("Failed to fetch inventory metrics")
 async def get_inventory_metrics(
+    request: Request,
     farmer_id: Optional[UUID] = Query(None, description="Farmer ID for filtering"),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get inventory metrics."""
-    try:
-        metrics = await AnalyticsService.get_inventory_metrics(db, farmer_id)
-        return metrics
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch inventory metrics"
-        )
+    body = await AnalyticsService.get_inventory_metrics(db, farmer_id)
+    return conditional_json_response(request, body)
 
 
 @router.get("/customers", response_model=CustomerMetrics)
+@_server_error("Failed to fetch customer metrics")
 async def get_customer_metrics(
+    request: Request,
     farmer_id: Optional[UUID] = Query(None, description="Farmer ID for filtering"),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get customer metrics."""
-    try:
-        metrics = await AnalyticsService.get_customer_metrics(db, farmer_id)
-        return metrics
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch customer metrics"
-        )
\ No newline at end of file
+    body = await AnalyticsService.get_customer_metrics(db, farmer_id)
+    return conditional_json_response(request, body)
\ No newline at end of file
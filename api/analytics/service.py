@@ -1,13 +1,14 @@
 """Analytics service layer for database operations."""
 
-from typing import List, Optional, Dict, Any
+import asyncio
+from typing import AsyncIterator, List, Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, desc
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, and_, or_, desc, case, cast, Text, lambda_stmt
 
+from api.cache import ANALYTICS_NAMESPACE, cached_json
 from packages.db.models import (
     Farmer as FarmerModel,
     Customer as CustomerModel,
@@ -31,41 +32,95 @@ from .models import (
     ShipmentInfo
 )
 
+# Statements built once per process; SQLAlchemy caches their compiled form
+# and per-call values are appended as bound parameters. Status literals are
+# fixed, so those statements don't track them as per-call parameters.
+_CUSTOMER_ORDER_TOTALS_STMT = lambda_stmt(
+    lambda: select(
+        func.count(OrderModel.id),
+        func.coalesce(func.sum(OrderModel.total_amount), 0)
+    )
+)
+
+_CUSTOMER_CREATED_AT_STMT = lambda_stmt(lambda: select(CustomerModel.created_at))
+
+_ORDER_ANALYTICS_STMT = lambda_stmt(
+    lambda: select(
+        func.count(OrderModel.id),
+        func.coalesce(func.sum(OrderModel.total_amount), 0),
+        func.count(OrderModel.id).filter(OrderModel.status == OrderStatus.FULFILLED)
+    ),
+    track_bound_values=False
+)
+
+_FARMER_ORDER_STATUS_STMT = lambda_stmt(
+    lambda: select(
+        func.count(OrderModel.id).filter(
+            or_(
+                OrderModel.status == OrderStatus.PAID,
+                OrderModel.status == OrderStatus.PENDING_PAYMENT
+            )
+        ).label("pending"),
+        func.count(OrderModel.id).filter(
+            OrderModel.status == OrderStatus.PAID
+        ).label("preparing"),
+        func.count(OrderModel.id).filter(
+            OrderModel.status == OrderStatus.FULFILLED
+        ).label("ready_to_ship")
+    ),
+    track_bound_values=False
+)
+
+_RECENT_ORDERS_STMT = lambda_stmt(
+    lambda: select(OrderModel.id, OrderModel.created_at, OrderModel.status)
+    .order_by(desc(OrderModel.created_at))
+)
+
 
 class AnalyticsService:
     """Service class for analytics-related database operations."""
 
     @staticmethod
+    async def _scalars_concurrently(db: AsyncSession, *queries) -> List[Any]:
+        """Run independent scalar queries concurrently on separate pooled connections."""
+        async def run(query):
+            async with db.bind.connect() as conn:
+                result = await conn.execute(query)
+                return result.scalar() or 0
+
+        return await asyncio.gather(*(run(query) for query in queries))
+
+    @staticmethod
+    @cached_json(ANALYTICS_NAMESPACE)
     async def get_farmer_dashboard_stats(
         db: AsyncSession,
         farmer_id: Optional[UUID] = None
     ) -> FarmerDashboardStats:
-        """Get dashboard statistics for farmer portal."""
+        """Get dashboard statistics for farmer portal as cached JSON bytes."""
         # If no farmer_id provided, get stats for all farmers (admin view)
         farmer_filter = ProductModel.farmer_id == farmer_id if farmer_id else True
         order_filter = OrderModel.farmer_id == farmer_id if farmer_id else True
 
         # Total active products
-        total_products_result = await db.execute(
-            select(func.count(ProductModel.id)).filter(
-                and_(ProductModel.is_active == True, farmer_filter)
-            )
+        total_products = (
+            select(func.count(ProductModel.id).filter(ProductModel.is_active == True))
+            .filter(farmer_filter)
+            .scalar_subquery()
         )
-        total_products = total_products_result.scalar() or 0
 
         # Pending orders
-        pending_orders_result = await db.execute(
-            select(func.count(OrderModel.id)).filter(
-                and_(
-                    OrderModel.status.in_([OrderStatus.PAID, OrderStatus.PENDING_PAYMENT]),
-                    order_filter
+        pending_orders = (
+            select(
+                func.count(OrderModel.id).filter(
+                    OrderModel.status.in_([OrderStatus.PAID, OrderStatus.PENDING_PAYMENT])
                 )
             )
+            .filter(order_filter)
+            .scalar_subquery()
         )
-        pending_orders = pending_orders_result.scalar() or 0
 
         # Active shipments
-        active_shipments_result = await db.execute(
+        active_shipments = (
             select(func.count(ShipmentModel.id))
             .select_from(ShipmentModel)
             .join(OrderModel)
@@ -75,20 +130,32 @@ class AnalyticsService:
                     order_filter
                 )
             )
+            .scalar_subquery()
         )
-        active_shipments = active_shipments_result.scalar() or 0
 
         # Total unique customers
-        total_customers_result = await db.execute(
-            select(func.count(func.distinct(OrderModel.customer_id))).filter(order_filter)
+        total_customers = (
+            select(func.count(func.distinct(OrderModel.customer_id)))
+            .filter(order_filter)
+            .scalar_subquery()
         )
-        total_customers = total_customers_result.scalar() or 0
 
-        return FarmerDashboardStats(
-            total_products=total_products,
-            pending_orders=pending_orders,
-            active_shipments=active_shipments,
-            total_customers=total_customers
+        # Fetch all counts in a single round-trip
+        result = await db.execute(
+            select(
+                total_products.label("total_products"),
+                pending_orders.label("pending_orders"),
+                active_shipments.label("active_shipments"),
+                total_customers.label("total_customers")
+            )
+        )
+        row = result.one()
+
+        return FarmerDashboardStats.model_construct(
+            total_products=row.total_products or 0,
+            pending_orders=row.pending_orders or 0,
+            active_shipments=row.active_shipments or 0,
+            total_customers=row.total_customers or 0
         )
 
     @staticmethod
@@ -99,64 +166,52 @@ class AnalyticsService:
         """Get customer account statistics."""
         if not customer_id:
             # Return demo stats
-            return CustomerStats(
+            return CustomerStats.model_construct(
                 total_orders=0,
                 total_spent=Decimal('0.0'),
                 customer_since='2024-11-24'
             )
 
         # Get order statistics
-        total_orders_result = await db.execute(
-            select(func.count(OrderModel.id)).filter(OrderModel.customer_id == customer_id)
-        )
-        total_orders = total_orders_result.scalar() or 0
-
-        total_spent_result = await db.execute(
-            select(func.sum(OrderModel.total_amount)).filter(OrderModel.customer_id == customer_id)
+        order_stats_result = await db.execute(
+            _CUSTOMER_ORDER_TOTALS_STMT + (lambda s: s.filter(OrderModel.customer_id == customer_id))
         )
-        total_spent = total_spent_result.scalar() or 0
+        total_orders, total_spent = order_stats_result.one()
 
         # Get customer creation date
         customer_result = await db.execute(
-            select(CustomerModel).filter(CustomerModel.id == customer_id)
+            _CUSTOMER_CREATED_AT_STMT + (lambda s: s.filter(CustomerModel.id == customer_id))
         )
-        customer = customer_result.scalar_one_or_none()
-        customer_since = customer.created_at.strftime('%Y-%m-%d') if customer and customer.created_at else '2024-11-24'
+        created_at = customer_result.scalar_one_or_none()
+        customer_since = created_at.date().isoformat() if created_at else '2024-11-24'
 
-        return CustomerStats(
+        return CustomerStats.model_construct(
             total_orders=total_orders,
             total_spent=Decimal(str(total_spent)),
             customer_since=customer_since
         )
 
     @staticmethod
+    @cached_json(ANALYTICS_NAMESPACE)
     async def get_order_analytics(
         db: AsyncSession,
         farmer_id: Optional[UUID] = None
     ) -> OrderAnalytics:
-        """Get order analytics data."""
-        # Base query
-        query = select(OrderModel)
+        """Get order analytics data as cached JSON bytes."""
+        # Aggregate orders from this month
+        this_month = datetime.now().replace(day=1)
+        stmt = _ORDER_ANALYTICS_STMT + (lambda s: s.filter(OrderModel.created_at >= this_month))
         if farmer_id:
-            query = query.filter(OrderModel.farmer_id == farmer_id)
+            stmt += lambda s: s.filter(OrderModel.farmer_id == farmer_id)
 
-        # Get orders from this month
-        this_month = datetime.now().replace(day=1)
-        orders_this_month_result = await db.execute(
-            query.filter(OrderModel.created_at >= this_month)
-        )
-        orders_this_month = orders_this_month_result.scalars().all()
+        order_stats_result = await db.execute(stmt)
+        total_orders, total_revenue, fulfilled_orders = order_stats_result.one()
 
         # Calculate metrics
-        total_orders = len(orders_this_month)
-        total_revenue = sum(order.total_amount for order in orders_this_month)
         avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
+        fulfillment_rate = (fulfilled_orders / total_orders * 100) if total_orders > 0 else 0.0
 
-        # Fulfilled orders rate
-        fulfilled_orders = [o for o in orders_this_month if o.status == OrderStatus.FULFILLED]
-        fulfillment_rate = (len(fulfilled_orders) / total_orders * 100) if total_orders > 0 else 0
-
-        return OrderAnalytics(
+        return OrderAnalytics.model_construct(
             orders_this_month=total_orders,
             total_revenue=Decimal(str(total_revenue)),
             avg_order_value=Decimal(str(avg_order_value)),
@@ -170,41 +225,16 @@ class AnalyticsService:
         farmer_id: UUID
     ) -> OrderStatusStats:
         """Get farmer order statistics by status."""
-        # Get order counts by status
-        pending_count_result = await db.execute(
-            select(func.count(OrderModel.id)).filter(
-                and_(
-                    OrderModel.farmer_id == farmer_id,
-                    OrderModel.status.in_([OrderStatus.PAID, OrderStatus.PENDING_PAYMENT])
-                )
-            )
+        # Get order counts by status in a single scan
+        result = await db.execute(
+            _FARMER_ORDER_STATUS_STMT + (lambda s: s.filter(OrderModel.farmer_id == farmer_id))
         )
-        pending_count = pending_count_result.scalar() or 0
+        row = result.one()
 
-        preparing_count_result = await db.execute(
-            select(func.count(OrderModel.id)).filter(
-                and_(
-                    OrderModel.farmer_id == farmer_id,
-                    OrderModel.status == OrderStatus.PAID
-                )
-            )
-        )
-        preparing_count = preparing_count_result.scalar() or 0
-
-        fulfilled_count_result = await db.execute(
-            select(func.count(OrderModel.id)).filter(
-                and_(
-                    OrderModel.farmer_id == farmer_id,
-                    OrderModel.status == OrderStatus.FULFILLED
-                )
-            )
-        )
-        fulfilled_count = fulfilled_count_result.scalar() or 0
-
-        return OrderStatusStats(
-            pending=pending_count,
-            preparing=preparing_count,
-            ready_to_ship=fulfilled_count,
+        return OrderStatusStats.model_construct(
+            pending=row.pending,
+            preparing=row.preparing,
+            ready_to_ship=row.ready_to_ship,
             packaging=0  # Placeholder
         )
 
@@ -221,79 +251,65 @@ class AnalyticsService:
 
         activities = []
 
-        # Get recent orders
+        # Get recent orders (newest first)
         recent_orders_result = await db.execute(
-            select(OrderModel)
-            .filter(OrderModel.customer_id == customer_id)
-            .order_by(desc(OrderModel.created_at))
-            .limit(limit)
+            _RECENT_ORDERS_STMT
+            + (lambda s: s.filter(OrderModel.customer_id == customer_id).limit(limit))
         )
-        recent_orders = recent_orders_result.scalars().all()
 
-        for order in recent_orders:
-            activities.append(RecentActivity(
-                date=order.created_at.strftime('%Y-%m-%d'),
-                action='Order placed' if order.status == OrderStatus.PENDING_PAYMENT else 'Order completed',
-                details=f"ORD-{order.created_at.strftime('%Y%m%d')}-{str(order.id)[:8]}"
+        for order_id, created_at, order_status in recent_orders_result.all():
+            order_date = created_at.date().isoformat()
+            activities.append(RecentActivity.model_construct(
+                date=order_date,
+                action='Order placed' if order_status == OrderStatus.PENDING_PAYMENT else 'Order completed',
+                details=f"ORD-{order_date.replace('-', '')}-{str(order_id)[:8]}"
             ))
 
-        # Sort by date (most recent first)
-        activities.sort(key=lambda x: x.date, reverse=True)
-
-        return activities[:limit]
+        # Already newest-first and limited by the query
+        return activities
 
     @staticmethod
     async def get_farmer_customers(
         db: AsyncSession,
         farmer_id: UUID,
         limit: int = 50
-    ) -> tuple[List[FarmerCustomerInfo], int]:
-        """Get customers who have ordered from a specific farmer."""
-        # Get customers who have placed orders with this farmer
+    ) -> AsyncIterator[FarmerCustomerInfo]:
+        """Stream customers who have ordered from a specific farmer."""
+        order_count = func.count(OrderModel.id)
+
+        # Aggregate order statistics per customer in a single query
         query = (
-            select(CustomerModel)
-            .join(OrderModel)
+            select(
+                CustomerModel.id,
+                func.concat(CustomerModel.first_name, " ", CustomerModel.last_name).label("name"),
+                CustomerModel.email,
+                CustomerModel.phone,
+                case(
+                    (func.coalesce(CustomerModel.city, "") != "",
+                     func.concat(CustomerModel.city, ", ", CustomerModel.country)),
+                    else_="N/A"
+                ).label("location"),
+                CustomerModel.marketing_opt_in,
+                # Bucket customers by order history in the same aggregate
+                case(
+                    (order_count >= 10, "VIP"),
+                    (order_count >= 3, "Active"),
+                    else_="New"
+                ).label("status"),
+                order_count.label("total_orders"),
+                func.coalesce(func.sum(OrderModel.total_amount), 0).label("total_spent"),
+                func.coalesce(
+                    func.to_char(func.max(OrderModel.created_at), "YYYY-MM-DD"), "Never"
+                ).label("last_order")
+            )
+            .join(OrderModel, OrderModel.customer_id == CustomerModel.id)
             .filter(OrderModel.farmer_id == farmer_id)
-            .distinct()
+            .group_by(CustomerModel.id)
             .limit(limit)
         )
-        customers_result = await db.execute(query)
-        customers = customers_result.scalars().all()
-
-        customer_list = []
-        for customer in customers:
-            # Get customer order statistics
-            customer_orders_result = await db.execute(
-                select(OrderModel).filter(
-                    and_(
-                        OrderModel.customer_id == customer.id,
-                        OrderModel.farmer_id == farmer_id
-                    )
-                )
-            )
-            customer_orders = customer_orders_result.scalars().all()
-
-            total_orders = len(customer_orders)
-            total_spent = sum(order.total_amount for order in customer_orders)
-            last_order = max(customer_orders, key=lambda x: x.created_at).created_at if customer_orders else None
-
-            # Determine status based on order history
-            status = "VIP" if total_orders >= 10 else "Active" if total_orders >= 3 else "New"
-
-            customer_list.append(FarmerCustomerInfo(
-                id=customer.id,
-                name=f"{customer.first_name} {customer.last_name}",
-                email=customer.email,
-                phone=customer.phone,
-                location=f"{customer.city}, {customer.country}" if customer.city else 'N/A',
-                status=status,
-                total_orders=total_orders,
-                total_spent=Decimal(str(total_spent)),
-                last_order=last_order.strftime('%Y-%m-%d') if last_order else 'Never',
-                marketing_opt_in=customer.marketing_opt_in
-            ))
+        result = await db.stream(query)
 
-        return customer_list, len(customer_list)
+        return (FarmerCustomerInfo.model_construct(**row) async for row in result.mappings())
 
     @staticmethod
     async def get_farmer_shipments(
@@ -301,10 +317,26 @@ class AnalyticsService:
         farmer_id: UUID,
         status: Optional[str] = None,
         limit: int = 50
-    ) -> tuple[List[ShipmentInfo], int]:
-        """Get shipments for a farmer's orders."""
+    ) -> AsyncIterator[ShipmentInfo]:
+        """Stream shipments for a farmer's orders."""
+        # Project only the response columns, building display strings in SQL
         query = (
-            select(ShipmentModel)
+            select(
+                ShipmentModel.id,
+                OrderModel.id.label("order_id"),
+                func.concat("ORD-", func.substr(cast(OrderModel.id, Text), 1, 8)).label("order_number"),
+                func.concat(CustomerModel.first_name, " ", CustomerModel.last_name).label("customer_name"),
+                cast(ShipmentModel.status, Text).label("status"),
+                ShipmentModel.tracking_number,
+                func.coalesce(ShipmentModel.carrier_name, "Farm Delivery").label("carrier_name"),
+                ShipmentModel.shipped_at,
+                ShipmentModel.delivered_at,
+                ShipmentModel.estimated_delivery_date,
+                ShipmentModel.created_at,
+                func.concat(OrderModel.shipping_address1, ", ", OrderModel.shipping_city).label("shipping_address"),
+                OrderModel.total_amount
+            )
+            .select_from(ShipmentModel)
             .join(OrderModel)
             .join(CustomerModel)
             .filter(OrderModel.farmer_id == farmer_id)
@@ -314,83 +346,54 @@ class AnalyticsService:
             query = query.filter(ShipmentModel.status == status)
 
         query = query.order_by(ShipmentModel.created_at.desc()).limit(limit)
-        shipments_result = await db.execute(query)
-        shipments = shipments_result.scalars().all()
-
-        shipment_list = []
-        for shipment in shipments:
-            # Load related data
-            order_result = await db.execute(
-                select(OrderModel)
-                .options(selectinload(OrderModel.customer))
-                .filter(OrderModel.id == shipment.order_id)
-            )
-            order = order_result.scalar_one_or_none()
-
-            if order:
-                customer = order.customer
-                shipment_list.append(ShipmentInfo(
-                    id=shipment.id,
-                    order_id=order.id,
-                    order_number=f"ORD-{str(order.id)[:8]}",
-                    customer_name=f"{customer.first_name} {customer.last_name}",
-                    status=shipment.status.value if hasattr(shipment.status, 'value') else shipment.status,
-                    tracking_number=shipment.tracking_number,
-                    carrier_name=shipment.carrier_name or 'Farm Delivery',
-                    shipped_at=shipment.shipped_at,
-                    delivered_at=shipment.delivered_at,
-                    estimated_delivery_date=shipment.estimated_delivery_date,
-                    created_at=shipment.created_at,
-                    shipping_address=f"{order.shipping_address1}, {order.shipping_city}",
-                    total_amount=order.total_amount
-                ))
-
-        return shipment_list, len(shipment_list)
+        shipments_result = await db.stream(query)
+
+        return (ShipmentInfo.model_construct(**row) async for row in shipments_result.mappings())
 
     @staticmethod
+    @cached_json(ANALYTICS_NAMESPACE)
     async def get_inventory_metrics(
         db: AsyncSession,
         farmer_id: Optional[UUID] = None
     ) -> InventoryMetrics:
-        """Get inventory metrics."""
+        """Get inventory metrics as cached JSON bytes."""
         farmer_filter = ProductModel.farmer_id == farmer_id if farmer_id else True
 
         # Total products
-        total_products_result = await db.execute(
-            select(func.count(ProductModel.id)).filter(farmer_filter)
-        )
-        total_products = total_products_result.scalar() or 0
+        total_products_query = select(func.count(ProductModel.id)).filter(farmer_filter)
 
         # Low stock products (less than 10)
-        low_stock_result = await db.execute(
-            select(func.count(ProductModel.id)).filter(
-                and_(
-                    ProductModel.stock_quantity <= 10,
-                    ProductModel.stock_quantity > 0,
-                    farmer_filter
-                )
+        low_stock_query = select(func.count(ProductModel.id)).filter(
+            and_(
+                ProductModel.stock_quantity <= 10,
+                ProductModel.stock_quantity > 0,
+                farmer_filter
             )
         )
-        low_stock_products = low_stock_result.scalar() or 0
 
         # Out of stock products
-        out_of_stock_result = await db.execute(
-            select(func.count(ProductModel.id)).filter(
-                and_(
-                    ProductModel.stock_quantity <= 0,
-                    farmer_filter
-                )
+        out_of_stock_query = select(func.count(ProductModel.id)).filter(
+            and_(
+                ProductModel.stock_quantity <= 0,
+                farmer_filter
             )
         )
-        out_of_stock_products = out_of_stock_result.scalar() or 0
 
         # Total stock value
-        stock_value_result = await db.execute(
-            select(func.sum(ProductModel.stock_quantity * ProductModel.price_per_unit)).filter(farmer_filter)
+        stock_value_query = select(
+            func.sum(ProductModel.stock_quantity * ProductModel.price_per_unit)
+        ).filter(farmer_filter)
+
+        (
+            total_products,
+            low_stock_products,
+            out_of_stock_products,
+            total_stock_value
+        ) = await AnalyticsService._scalars_concurrently(
+            db, total_products_query, low_stock_query, out_of_stock_query, stock_value_query
         )
-        total_stock_value = stock_value_result.scalar() or 0
 
-        return InventoryMetrics(
+        return InventoryMetrics.model_construct(
             total_products=total_products,
             low_stock_products=low_stock_products,
             out_of_stock_products=out_of_stock_products,
@@ -398,23 +401,23 @@ class AnalyticsService:
         )
 
     @staticmethod
+    @cached_json(ANALYTICS_NAMESPACE)
     async def get_customer_metrics(
         db: AsyncSession,
         farmer_id: Optional[UUID] = None
     ) -> CustomerMetrics:
-        """Get customer metrics."""
+        """Get customer metrics as cached JSON bytes."""
         # Base query filter
         order_filter = OrderModel.farmer_id == farmer_id if farmer_id else True
 
         # Total customers
-        total_customers_result = await db.execute(
-            select(func.count(func.distinct(OrderModel.customer_id))).filter(order_filter)
-        )
-        total_customers = total_customers_result.scalar() or 0
+        total_customers_query = select(
+            func.count(func.distinct(OrderModel.customer_id))
+        ).filter(order_filter)
 
         # New customers this month
         this_month = datetime.now().replace(day=1)
-        new_customers_result = await db.execute(
+        new_customers_query = (
             select(func.count(func.distinct(OrderModel.customer_id)))
             .filter(
                 and_(
@@ -423,23 +426,28 @@ class AnalyticsService:
                 )
             )
         )
-        new_customers_this_month = new_customers_result.scalar() or 0
 
         # Repeat customers (customers with more than 1 order)
-        repeat_customers_result = await db.execute(
-            select(func.count()).select_from(
-                select(OrderModel.customer_id)
-                .filter(order_filter)
-                .group_by(OrderModel.customer_id)
-                .having(func.count(OrderModel.id) > 1)
-            )
+        repeat_customers_query = select(func.count()).select_from(
+            select(OrderModel.customer_id)
+            .filter(order_filter)
+            .group_by(OrderModel.customer_id)
+            .having(func.count(OrderModel.id) > 1)
+            .subquery()
+        )
+
+        (
+            total_customers,
+            new_customers_this_month,
+            repeat_customers
+        ) = await AnalyticsService._scalars_concurrently(
+            db, total_customers_query, new_customers_query, repeat_customers_query
         )
-        repeat_customers = repeat_customers_result.scalar() or 0
 
         # Customer retention rate
-        retention_rate = (repeat_customers / total_customers * 100) if total_customers > 0 else 0
+        retention_rate = (repeat_customers / total_customers * 100) if total_customers > 0 else 0.0
 
-        return CustomerMetrics(
+        return CustomerMetrics.model_construct(
             total_customers=total_customers,
             new_customers_this_month=new_customers_this_month,
             repeat_customers=repeat_customers,
@@ -1,6 +1,6 @@
 """Authentication models for From Field to You API."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator, model_validator
 from typing import Optional
 
 
@@ -33,4 +33,33 @@ class AuthResponse(BaseModel):
     # Role-specific fields
     farm_name: Optional[str] = None  # For farmers
     first_name: Optional[str] = None  # For customers
-    last_name: Optional[str] = None   # For customers
\ No newline at end of file
+    last_name: Optional[str] = None   # For customers
+
+    @field_validator("id", mode="before")
+    @classmethod
+    def id_to_str(cls, value):
+        """Accept UUID primary keys straight from ORM rows."""
+        return str(value)
+
+
+class FarmerAuthResponse(AuthResponse):
+    """Authentication response read directly from a farmer row."""
+    role: str = "farmer"
+
+    class Config:
+        from_attributes = True
+
+
+class CustomerAuthResponse(AuthResponse):
+    """Authentication response read directly from a customer row."""
+    name: str = ""
+    role: str = "customer"
+
+    class Config:
+        from_attributes = True
+
+    @model_validator(mode="after")
+    def set_full_name(self):
+        """Build the display name from first and last name."""
+        self.name = f"{self.first_name} {self.last_name}"
+        return self
@@ -1,16 +1,24 @@
 """Authentication routes for From Field to You API."""
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from packages.db.session import get_async_db
-from .models import LoginRequest, RegisterCustomerRequest, AuthResponse
+from api.cache import FARMER_NAMESPACE, response_cache
+from api.rate_limit import auth_rate_limit
+from api.responses import conditional_json_response, dump_json
+from .models import (
+    LoginRequest, RegisterCustomerRequest, AuthResponse,
+    FarmerAuthResponse, CustomerAuthResponse
+)
 from .service import AuthService
 
 router = APIRouter()
 
+ADMIN_FARMER_CACHE_KEY = f"{FARMER_NAMESPACE}:admin"
 
-@router.post("/farmer/login", response_model=AuthResponse)
+
+@router.post("/farmer/login", response_model=AuthResponse, dependencies=[Depends(auth_rate_limit)])
 async def farmer_login(
     login_data: LoginRequest,
     db: AsyncSession = Depends(get_async_db)
@@ -20,16 +28,10 @@ async def farmer_login(
     if not farmer:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
-    return AuthResponse(
-        id=str(farmer.id),
-        name=farmer.name,
-        email=farmer.email,
-        farm_name=farmer.farm_name,
-        role="farmer"
-    )
+    return FarmerAuthResponse.model_validate(farmer)
 
 
-@router.post("/customer/login", response_model=AuthResponse)
+@router.post("/customer/login", response_model=AuthResponse, dependencies=[Depends(auth_rate_limit)])
 async def customer_login(
     login_data: LoginRequest,
     db: AsyncSession = Depends(get_async_db)
@@ -39,17 +41,15 @@ async def customer_login(
     if not customer:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
-    return AuthResponse(
-        id=str(customer.id),
-        name=f"{customer.first_name} {customer.last_name}",
-        email=customer.email,
-        first_name=customer.first_name,
-        last_name=customer.last_name,
-        role="customer"
-    )
+    return CustomerAuthResponse.model_validate(customer)
 
 
-@router.post("/customer/register", response_model=AuthResponse, status_code=201)
+@router.post(
+    "/customer/register",
+    response_model=AuthResponse,
+    status_code=201,
+    dependencies=[Depends(auth_rate_limit)]
+)
 async def customer_register(
     register_data: RegisterCustomerRequest,
     db: AsyncSession = Depends(get_async_db)
@@ -57,31 +57,26 @@ async def customer_register(
     """Register a new customer and return user info."""
     try:
         customer = await AuthService.register_customer(db, register_data)
-        return AuthResponse(
-            id=str(customer.id),
-            name=f"{customer.first_name} {customer.last_name}",
-            email=customer.email,
-            first_name=customer.first_name,
-            last_name=customer.last_name,
-            role="customer"
-        )
+        return CustomerAuthResponse.model_validate(customer)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/farmer/admin", response_model=AuthResponse)
 async def get_admin_farmer(
+    request: Request,
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get the admin farmer info (single farmer model)."""
+    # Public and identical for every caller; cleared whenever a farmer changes
+    cached = await response_cache.get(ADMIN_FARMER_CACHE_KEY)
+    if cached is not None:
+        return conditional_json_response(request, cached)
+
     farmer = await AuthService.get_admin_farmer(db)
     if not farmer:
         raise HTTPException(status_code=404, detail="Admin farmer not found")
 
-    return AuthResponse(
-        id=str(farmer.id),
-        name=farmer.name,
-        email=farmer.email,
-        farm_name=farmer.farm_name,
-        role="farmer"
-    )
\ No newline at end of file
+    body = dump_json(FarmerAuthResponse.model_validate(farmer).model_dump())
+    await response_cache.set(ADMIN_FARMER_CACHE_KEY, body)
+    return conditional_json_response(request, body)
\ No newline at end of file
@@ -1,13 +1,29 @@
 """Authentication service layer for From Field to You API."""
 
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
 import bcrypt
 
+from api.cache import CUSTOMER_LIST_NAMESPACE, response_cache
 from packages.db.models import Farmer as FarmerModel, Customer as CustomerModel
 from .models import RegisterCustomerRequest
 
+# bcrypt work factor for new hashes; existing hashes below it are upgraded on login
+BCRYPT_COST = int(os.getenv("BCRYPT_COST", "12"))
+
+# bcrypt is CPU-bound and releases the GIL, so hashing runs off the event loop
+_BCRYPT_POOL = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="bcrypt")
+
+# Verified against when no account matches, so unknown emails cost the same
+# bcrypt time as wrong passwords
+_DUMMY_PASSWORD_HASH = bcrypt.hashpw(b"from-field-dummy-password", bcrypt.gensalt(BCRYPT_COST))
+
 
 class AuthService:
     """Service class for authentication operations."""
@@ -22,6 +38,33 @@ class AuthService:
         """Normalize password: trim leading/trailing whitespace."""
         return password.strip() if password else ""
 
+    @staticmethod
+    async def _check_password(password: str, password_hash: bytes) -> bool:
+        """Verify a password against an encoded bcrypt hash without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _BCRYPT_POOL,
+            partial(bcrypt.checkpw, password.encode('utf-8'), password_hash)
+        )
+
+    @staticmethod
+    async def _hash_password(password: str) -> str:
+        """Hash a password with bcrypt without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        password_hash = await loop.run_in_executor(
+            _BCRYPT_POOL,
+            partial(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(BCRYPT_COST))
+        )
+        return password_hash.decode('utf-8')
+
+    @staticmethod
+    def _needs_rehash(password_hash: str) -> bool:
+        """Check whether a bcrypt hash ($2b$<cost>$...) uses a lower cost than BCRYPT_COST."""
+        try:
+            return int(password_hash.split('$')[2]) < BCRYPT_COST
+        except (IndexError, ValueError):
+            return False
+
     @staticmethod
     async def authenticate_farmer(db: AsyncSession, email: str, password: str) -> Optional[FarmerModel]:
         """Authenticate farmer by email and password (case-insensitive email)."""
@@ -42,8 +85,14 @@ class AuthService:
 
         if farmer and farmer.password_hash:
             # Verify password using bcrypt
-            if bcrypt.checkpw(clean_password.encode('utf-8'), farmer.password_hash.encode('utf-8')):
+            if await AuthService._check_password(clean_password, farmer.password_hash.encode('utf-8')):
+                if AuthService._needs_rehash(farmer.password_hash):
+                    farmer.password_hash = await AuthService._hash_password(clean_password)
+                    await db.commit()
                 return farmer
+        else:
+            # Keep response time independent of whether the email exists
+            await AuthService._check_password(clean_password, _DUMMY_PASSWORD_HASH)
 
         return None
 
@@ -64,8 +113,14 @@ class AuthService:
 
         if customer and customer.password_hash:
             # Verify password using bcrypt
-            if bcrypt.checkpw(clean_password.encode('utf-8'), customer.password_hash.encode('utf-8')):
+            if await AuthService._check_password(clean_password, customer.password_hash.encode('utf-8')):
+                if AuthService._needs_rehash(customer.password_hash):
+                    customer.password_hash = await AuthService._hash_password(clean_password)
+                    await db.commit()
                 return customer
+        else:
+            # Keep response time independent of whether the email exists
+            await AuthService._check_password(clean_password, _DUMMY_PASSWORD_HASH)
 
         return None
 
@@ -92,13 +147,8 @@ class AuthService:
         if not clean_password:
             raise ValueError("Password is required")
         
-        # Check if email already exists (case-insensitive)
-        existing_customer = await AuthService.get_customer_by_email(db, clean_email)
-        if existing_customer:
-            raise ValueError("Customer with this email already exists")
-
         # Hash the password
-        password_hash = bcrypt.hashpw(clean_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        password_hash = await AuthService._hash_password(clean_password)
 
         # Create customer data with normalized email
         customer_data = {
@@ -115,10 +165,20 @@ class AuthService:
             'marketing_opt_in': False
         }
 
-        db_customer = CustomerModel(**customer_data)
-        db.add(db_customer)
+        # Insert unless the email is already taken in any letter case
+        stmt = (
+            insert(CustomerModel)
+            .values(**customer_data)
+            .on_conflict_do_nothing(index_elements=[func.lower(CustomerModel.email)])
+            .returning(CustomerModel)
+        )
+        result = await db.execute(stmt)
+        db_customer = result.scalar_one_or_none()
+        if db_customer is None:
+            raise ValueError("Customer with this email already exists")
+
         await db.commit()
-        await db.refresh(db_customer)
+        await response_cache.bump_version(CUSTOMER_LIST_NAMESPACE)
         return db_customer
 
     @staticmethod
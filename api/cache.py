@@ -0,0 +1,220 @@
+"""Short-lived response caching shared by API services.
+
+Entries are stored as serialized JSON bytes. Redis is used when REDIS_URL is
+configured so every worker shares the same entries; otherwise a per-process
+in-memory store is used, which is sufficient for a single worker.
+"""
+
+import logging
+import os
+import heapq
+import time
+from functools import wraps
+from typing import Awaitable, Callable, Optional
+
+import redis.asyncio as redis
+from pydantic import BaseModel
+
+from api.responses import dump_json
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "60"))
+
+# Namespace for dashboard/metric results derived from orders, products and shipments
+ANALYTICS_NAMESPACE = "analytics"
+
+# Namespace for public farmer profile responses
+FARMER_NAMESPACE = "farmer"
+
+# Namespace for single-customer responses, keyed by customer id
+CUSTOMER_NAMESPACE = "customer"
+
+# Namespaces for paginated list responses, invalidated by bumping a version
+# counter rather than scanning for keys, since carts change on every item edit
+CART_LIST_NAMESPACE = "cart_list"
+CUSTOMER_LIST_NAMESPACE = "customer_list"
+LIST_CACHE_TTL_SECONDS = int(os.getenv("LIST_CACHE_TTL_SECONDS", "10"))
+
+# Outlives any list entry, so a version restarting from zero never matches old entries
+_LIST_VERSION_TTL_SECONDS = 24 * 60 * 60
+
+# Bounds for the in-process store: expired entries are swept every
+# _MEMORY_SWEEP_INTERVAL writes, and past MEMORY_CACHE_MAX_ENTRIES the entries
+# closest to expiry are dropped first
+MEMORY_CACHE_MAX_ENTRIES = int(os.getenv("MEMORY_CACHE_MAX_ENTRIES", "10000"))
+_MEMORY_SWEEP_INTERVAL = 1000
+
+
+class _MemoryBackend:
+    """In-process TTL store used when Redis is not configured.
+
+    Keys that are never read again (superseded list versions, one-off
+    queries, rate-limit counters) would otherwise stay forever, so writes
+    periodically sweep expired entries and the store never grows past
+    ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int = MEMORY_CACHE_MAX_ENTRIES):
+        self._entries: dict[str, tuple[float, bytes]] = {}
+        self._max_entries = max_entries
+        self._writes = 0
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the soonest-expiring ones if still over capacity."""
+        now = time.monotonic()
+        for key in [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+
+        if len(self._entries) > self._max_entries:
+            # Trim to 90% so a full store is not rescanned on every write;
+            # long-lived entries such as list version counters go last
+            excess = len(self._entries) - self._max_entries * 9 // 10
+            for key in heapq.nsmallest(excess, self._entries, key=lambda key: self._entries[key][0]):
+                del self._entries[key]
+
+    def _store(self, key: str, entry: tuple) -> None:
+        self._entries[key] = entry
+        self._writes += 1
+        if self._writes % _MEMORY_SWEEP_INTERVAL == 0 or len(self._entries) > self._max_entries:
+            self._evict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._store(key, (time.monotonic() + ttl, value))
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            self._entries.pop(key, None)
+
+    async def incr(self, key: str, ttl: int) -> int:
+        now = time.monotonic()
+        expires_at, count = self._entries.get(key, (0.0, 0))
+        if expires_at <= now:
+            expires_at, count = now + ttl, 0
+        self._store(key, (expires_at, count + 1))
+        return count + 1
+
+
+class _RedisBackend:
+    """Redis store shared across workers."""
+
+    def __init__(self, url: str):
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self._client.set(key, value, ex=ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        keys = [key async for key in self._client.scan_iter(match=f"{prefix}*")]
+        if keys:
+            await self._client.delete(*keys)
+
+    async def incr(self, key: str, ttl: int) -> int:
+        count = await self._client.incr(key)
+        if count == 1:
+            await self._client.expire(key, ttl)
+        return count
+
+
+class ResponseCache:
+    """Namespaced byte cache. Backend failures are logged and treated as misses."""
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self._backend.get(key)
+        except Exception as e:
+            logger.warning(f"Cache get failed for {key}: {str(e)}")
+            return None
+
+    async def set(self, key: str, value: bytes, ttl: int = CACHE_TTL_SECONDS) -> None:
+        try:
+            await self._backend.set(key, value, ttl)
+        except Exception as e:
+            logger.warning(f"Cache set failed for {key}: {str(e)}")
+
+    async def increment(self, key: str, ttl: int) -> int:
+        """Increment a counter that expires ttl seconds after its first increment."""
+        try:
+            return await self._backend.incr(key, ttl)
+        except Exception as e:
+            logger.warning(f"Cache increment failed for {key}: {str(e)}")
+            return 0
+
+    async def delete(self, key: str) -> None:
+        """Drop a single entry."""
+        try:
+            await self._backend.delete(key)
+        except Exception as e:
+            logger.warning(f"Cache delete failed for {key}: {str(e)}")
+
+    async def versioned_key(self, namespace: str, suffix: str) -> str:
+        """Build a key that stops matching once bump_version is called for the namespace."""
+        version = await self.get(f"{namespace}:version")
+        return f"{namespace}:{int(version or 0)}:{suffix}"
+
+    async def bump_version(self, namespace: str) -> None:
+        """Invalidate every versioned_key entry in a namespace with a single increment."""
+        await self.increment(f"{namespace}:version", _LIST_VERSION_TTL_SECONDS)
+
+    async def invalidate(self, namespace: str) -> None:
+        """Drop every entry stored under a namespace."""
+        try:
+            await self._backend.delete_prefix(f"{namespace}:")
+        except Exception as e:
+            logger.warning(f"Cache invalidation failed for {namespace}: {str(e)}")
+
+
+response_cache = ResponseCache(_RedisBackend(REDIS_URL) if REDIS_URL else _MemoryBackend())
+
+
+def cached_json(
+    namespace: str, ttl: int = CACHE_TTL_SECONDS
+) -> Callable[[Callable[..., Awaitable[BaseModel]]], Callable[..., Awaitable[bytes]]]:
+    """Cache a service method's Pydantic result as JSON bytes, keyed by namespace, method name and arguments.
+
+    The decorated method returns the serialized bytes, ready to be used as a
+    response body. The first argument (the database session) is not part of
+    the key. Cache hits touch neither the database nor Pydantic.
+    """
+    def decorator(func: Callable[..., Awaitable[BaseModel]]) -> Callable[..., Awaitable[bytes]]:
+        @wraps(func)
+        async def wrapper(db, *args, **kwargs) -> bytes:
+            key_parts = [namespace, func.__name__, *map(str, args)]
+            key_parts.extend(f"{name}={value}" for name, value in sorted(kwargs.items()))
+            key = ":".join(key_parts)
+
+            cached = await response_cache.get(key)
+            if cached is not None:
+                return cached
+
+            result = await func(db, *args, **kwargs)
+            body = dump_json(result.model_dump())
+            await response_cache.set(key, body, ttl)
+            return body
+
+        return wrapper
+
+    return decorator
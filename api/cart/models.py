@@ -86,4 +86,5 @@ class CartList(BaseModel):
     carts: List[Cart]
     total: int = Field(..., description="Total number of carts")
     page: int = Field(default=1, description="Current page number")
-    size: int = Field(default=50, description="Number of items per page")
\ No newline at end of file
+    size: int = Field(default=50, description="Number of items per page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if there is one")
\ No newline at end of file
@@ -2,11 +2,14 @@
 
 from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from packages.db.session import get_async_db
 from packages.db.models import CartStatus
+from api.cache import CART_LIST_NAMESPACE, LIST_CACHE_TTL_SECONDS, response_cache
+from api.pagination import decode_cursor, next_cursor
+from api.responses import ORJSONResponse, dump_json, etag_matches
 from .service import CartService
 from .models import (
     Cart, CartItem, CartList, CartWithItems, CartCreate, CartUpdate,
@@ -15,62 +18,115 @@ from .models import (
 
 router = APIRouter(prefix="/cart", tags=["cart"])
 
-
-def serialize_cart_with_items(cart, totals: dict) -> CartWithItems:
-    """Helper to properly serialize cart ORM model to Pydantic response."""
-    return CartWithItems(
+# Response body for sessions that have no cart yet (session_id/status filled per request)
+_EMPTY_CART = {
+    "id": None,
+    "customer_id": None,
+    "items": [],
+    "total_amount": "0",
+    "item_count": 0,
+    "created_at": None,
+    "updated_at": None
+}
+
+
+def serialize_cart_with_items(cart, totals: dict) -> ORJSONResponse:
+    """Helper to properly serialize cart ORM model to a CartWithItems response.
+
+    Rows come straight from the database, so the models are built without
+    validation and rendered directly instead of going through response_model.
+    """
+    items = [
+        CartItem.model_construct(
+            id=item.id,
+            cart_id=item.cart_id,
+            product_id=item.product_id,
+            quantity=item.quantity,
+            unit_price=item.unit_price,
+            created_at=item.created_at,
+            updated_at=item.updated_at
+        ) for item in cart.cart_items
+    ]
+    cart_with_items = CartWithItems.model_construct(
         id=cart.id,
         session_id=cart.session_id,
         customer_id=cart.customer_id,
-        status=cart.status.value if hasattr(cart.status, 'value') else cart.status,
+        status=cart.status,  # CartStatus; orjson writes enums as their value
         created_at=cart.created_at,
         updated_at=cart.updated_at,
-        items=[
-            CartItem(
-                id=item.id,
-                cart_id=item.cart_id,
-                product_id=item.product_id,
-                quantity=item.quantity,
-                unit_price=item.unit_price,
-                created_at=item.created_at,
-                updated_at=item.updated_at
-            ) for item in cart.cart_items  # Fixed: cart_items not items
-        ],
+        items=items,
         total_amount=totals["total"],
         item_count=totals["item_count"]
     )
+    return ORJSONResponse(content=cart_with_items.model_dump())
+
+
+def cart_etag(cart) -> str:
+    """ETag for a cart; every item change also bumps the cart's updated_at."""
+    return f'"{cart.id}-{cart.updated_at.timestamp()}"'
+
+
+def conditional_cart_response(request: Request, cart) -> Response:
+    """Serialize a cart with its ETag, or return an empty 304 if the client has it."""
+    etag = cart_etag(cart)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response = serialize_cart_with_items(cart, CartService.calculate_totals(cart))
+    response.headers.update(headers)
+    return response
 
 
 @router.get("/", response_model=CartList)
 async def get_carts(
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of carts to skip"),
     limit: int = Query(50, ge=1, le=100, description="Number of carts to return"),
     session_id: Optional[str] = Query(None, description="Filter by session ID"),
     customer_id: Optional[UUID] = Query(None, description="Filter by customer ID"),
     status: Optional[CartStatus] = Query(None, description="Filter by cart status"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides skip"),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get carts with pagination and filtering."""
+    # Served from the list cache until a cart changes or the entry expires
+    cache_key = await response_cache.versioned_key(CART_LIST_NAMESPACE, request.url.query)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        # The status filter shadows fastapi.status here
+        raise HTTPException(status_code=400, detail=str(e))
+
     carts, total = await CartService.get_carts(
         db=db,
         skip=skip,
         limit=limit,
         session_id=session_id,
         customer_id=customer_id,
-        status=status
+        status=status,
+        after=after
     )
 
     page = (skip // limit) + 1
-    return CartList(
+    body = dump_json(CartList(
         carts=carts,
         total=total,
         page=page,
-        size=limit
-    )
+        size=limit,
+        next_cursor=next_cursor(carts, limit, "updated_at")
+    ).model_dump())
+    await response_cache.set(cache_key, body, LIST_CACHE_TTL_SECONDS)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{cart_id}", response_model=CartWithItems)
 async def get_cart(
+    request: Request,
     cart_id: UUID,
     db: AsyncSession = Depends(get_async_db)
 ):
@@ -82,12 +138,12 @@ async def get_cart(
             detail="Cart not found"
         )
 
-    totals = await CartService.get_cart_totals(db, cart_id)
-    return serialize_cart_with_items(cart, totals)
+    return conditional_cart_response(request, cart)
 
 
 @router.get("/session/{session_id}", response_model=CartWithItems)
 async def get_cart_by_session(
+    request: Request,
     session_id: str,
     status: CartStatus = Query(CartStatus.ACTIVE, description="Cart status"),
     db: AsyncSession = Depends(get_async_db)
@@ -96,19 +152,9 @@ async def get_cart_by_session(
     cart = await CartService.get_cart_by_session(db, session_id, status)
     if not cart:
         # Return empty cart structure
-        return CartWithItems(
-            id=None,
-            session_id=session_id,
-            status=status.value,
-            items=[],
-            total_amount=0,
-            item_count=0,
-            created_at=None,
-            updated_at=None
-        )
+        return ORJSONResponse(content={**_EMPTY_CART, "session_id": session_id, "status": status.value})
 
-    totals = await CartService.get_cart_totals(db, cart.id)
-    return serialize_cart_with_items(cart, totals)
+    return conditional_cart_response(request, cart)
 
 
 @router.post("/", response_model=Cart, status_code=status.HTTP_201_CREATED)
@@ -119,7 +165,7 @@ async def create_cart(
     """Create a new cart."""
     try:
         cart = await CartService.create_cart(db, cart_data)
-        return cart
+        return ORJSONResponse(content=Cart.model_validate(cart).model_dump(), status_code=status.HTTP_201_CREATED)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -141,7 +187,7 @@ async def update_cart(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Cart not found"
             )
-        return cart
+        return ORJSONResponse(content=Cart.model_validate(cart).model_dump())
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -179,7 +225,7 @@ async def add_item_to_cart(
                 detail="Failed to add item to cart"
             )
 
-        totals = await CartService.get_cart_totals(db, cart.id)
+        totals = CartService.calculate_totals(cart)
         return serialize_cart_with_items(cart, totals)
     except ValueError as e:
         raise HTTPException(
@@ -208,7 +254,7 @@ async def update_cart_item(
                 detail="Cart item not found"
             )
 
-        totals = await CartService.get_cart_totals(db, cart.id)
+        totals = CartService.calculate_totals(cart)
         return serialize_cart_with_items(cart, totals)
     except ValueError as e:
         raise HTTPException(
@@ -236,7 +282,7 @@ async def remove_cart_item(
                 detail="Cart item not found"
             )
 
-        totals = await CartService.get_cart_totals(db, cart.id)
+        totals = CartService.calculate_totals(cart)
         return serialize_cart_with_items(cart, totals)
     except Exception as e:
         raise HTTPException(
@@ -271,4 +317,4 @@ async def convert_cart_to_order(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Cart not found"
         )
-    return cart
+    return ORJSONResponse(content=Cart.model_validate(cart).model_dump())
@@ -3,11 +3,14 @@
 from typing import List, Optional
 from uuid import UUID
 from decimal import Decimal
-from datetime import datetime, UTC
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, and_, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, delete, and_, func, bindparam, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import joinedload
 
+from api.cache import CART_LIST_NAMESPACE, response_cache
+from api.pagination import fetch_page
 from packages.db.models import (
     Cart as CartModel,
     CartItem as CartItemModel,
@@ -16,6 +19,25 @@ from packages.db.models import (
 )
 from .models import CartCreate, CartUpdate, CartItemCreate, CartItemUpdate
 
+# Single-cart lookups are built once so each call reuses the cached compilation.
+# get_cart joins the items in so one round-trip returns the whole cart, and
+# refreshes objects already in the session after a mutation.
+_GET_CART_STMT = (
+    select(CartModel)
+    .where(CartModel.id == bindparam("cart_id"))
+    .options(joinedload(CartModel.cart_items))
+    .execution_options(populate_existing=True)
+)
+
+_GET_CART_BY_SESSION_STMT = (
+    select(CartModel)
+    .where(and_(
+        CartModel.session_id == bindparam("session_id"),
+        CartModel.status == bindparam("status")
+    ))
+    .options(joinedload(CartModel.cart_items))
+)
+
 
 class CartService:
     """Service class for cart-related database operations."""
@@ -27,9 +49,14 @@ class CartService:
         limit: int = 50,
         session_id: Optional[str] = None,
         customer_id: Optional[UUID] = None,
-        status: Optional[CartStatus] = None
+        status: Optional[CartStatus] = None,
+        after: Optional[tuple[datetime, UUID]] = None
     ) -> tuple[List[CartModel], int]:
-        """Get carts with pagination and filtering."""
+        """Get carts with pagination and filtering.
+
+        When ``after`` (the last seen ``(updated_at, id)``) is given, the page
+        starts right after that row and ``skip`` is ignored.
+        """
         query = select(CartModel)
         filters = []
 
@@ -43,40 +70,23 @@ class CartService:
         if filters:
             query = query.where(and_(*filters))
 
-        # Get total count
-        count_query = select(CartModel.id)
-        if filters:
-            count_query = count_query.where(and_(*filters))
-
-        total_result = await db.execute(count_query)
-        total = len(total_result.fetchall())
+        if after is not None:
+            query = query.where(tuple_(CartModel.updated_at, CartModel.id) < after)
+        else:
+            query = query.offset(skip)
 
-        # Get paginated results with items
+        # Get paginated results (list responses don't include items) and total count
         query = (
-            query.options(
-                selectinload(CartModel.cart_items).selectinload(CartItemModel.product)
-            )
-            .offset(skip)
-            .limit(limit)
-            .order_by(CartModel.updated_at.desc())
+            query.limit(limit)
+            .order_by(CartModel.updated_at.desc(), CartModel.id.desc())
         )
-        result = await db.execute(query)
-        carts = result.scalars().all()
-
-        return carts, total
+        return await fetch_page(db, CartModel, query, filters)
 
     @staticmethod
     async def get_cart(db: AsyncSession, cart_id: UUID) -> Optional[CartModel]:
         """Get a cart by ID with all items."""
-        query = (
-            select(CartModel)
-            .where(CartModel.id == cart_id)
-            .options(
-                selectinload(CartModel.cart_items).selectinload(CartItemModel.product)
-            )
-        )
-        result = await db.execute(query)
-        return result.scalar_one_or_none()
+        result = await db.execute(_GET_CART_STMT, {"cart_id": cart_id})
+        return result.unique().scalar_one_or_none()
 
     @staticmethod
     async def get_cart_by_session(
@@ -85,15 +95,10 @@ class CartService:
         status: CartStatus = CartStatus.ACTIVE
     ) -> Optional[CartModel]:
         """Get active cart for a session."""
-        query = (
-            select(CartModel)
-            .where(and_(CartModel.session_id == session_id, CartModel.status == status))
-            .options(
-                selectinload(CartModel.cart_items).selectinload(CartItemModel.product)
-            )
+        result = await db.execute(
+            _GET_CART_BY_SESSION_STMT, {"session_id": session_id, "status": status}
         )
-        result = await db.execute(query)
-        return result.scalar_one_or_none()
+        return result.unique().scalar_one_or_none()
 
     @staticmethod
     async def create_cart(db: AsyncSession, cart_data: CartCreate) -> CartModel:
@@ -105,6 +110,7 @@ class CartService:
         )
         db.add(db_cart)
         await db.commit()
+        await response_cache.bump_version(CART_LIST_NAMESPACE)
         await db.refresh(db_cart)
         return db_cart
 
@@ -115,39 +121,34 @@ class CartService:
         cart_update: CartUpdate
     ) -> Optional[CartModel]:
         """Update a cart."""
-        cart = await CartService.get_cart(db, cart_id)
-        if not cart:
-            return None
-
         update_data = cart_update.model_dump(exclude_unset=True)
-        if update_data:
-            update_data['updated_at'] = datetime.now(UTC)
-            stmt = (
-                update(CartModel)
-                .where(CartModel.id == cart_id)
-                .values(**update_data)
-            )
-            await db.execute(stmt)
-            await db.commit()
-            await db.refresh(cart)
+        if not update_data:
+            return await db.get(CartModel, cart_id)
+
+        stmt = (
+            update(CartModel)
+            .where(CartModel.id == cart_id)
+            .values(**update_data, updated_at=func.now())
+            .returning(CartModel)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await db.execute(stmt)
+        cart = result.scalar_one_or_none()
+        await db.commit()
+        await response_cache.bump_version(CART_LIST_NAMESPACE)
 
         return cart
 
     @staticmethod
     async def delete_cart(db: AsyncSession, cart_id: UUID) -> bool:
         """Delete a cart and all its items."""
-        cart = await CartService.get_cart(db, cart_id)
-        if not cart:
-            return False
-
-        # Delete cart items first
-        await db.execute(delete(CartItemModel).where(CartItemModel.cart_id == cart_id))
-
-        # Delete cart
-        stmt = delete(CartModel).where(CartModel.id == cart_id)
-        await db.execute(stmt)
+        # cart_item.cart_id is ON DELETE CASCADE, so the items go with the cart
+        stmt = delete(CartModel).where(CartModel.id == cart_id).returning(CartModel.id)
+        result = await db.execute(stmt)
+        deleted = result.scalar_one_or_none() is not None
         await db.commit()
-        return True
+        await response_cache.bump_version(CART_LIST_NAMESPACE)
+        return deleted
 
     @staticmethod
     async def add_item_to_cart(
@@ -158,17 +159,24 @@ class CartService:
     ) -> Optional[CartModel]:
         """Add item to cart or update quantity if exists."""
         try:
-            # Get or create cart
-            cart = await CartService.get_cart_by_session(db, session_id)
-            if not cart:
-                cart = await CartService.create_cart(
-                    db, CartCreate(session_id=session_id)
-                )
-
-            # Get product details
-            product = await db.get(ProductModel, product_id)
-            if not product:
+            # Load the product together with the session's active cart id. The
+            # product row is share-locked so its stock cannot change before the
+            # upsert below checks against it.
+            active_cart_id = (
+                select(CartModel.id)
+                .where(and_(CartModel.session_id == session_id, CartModel.status == CartStatus.ACTIVE))
+                .limit(1)
+                .scalar_subquery()
+            )
+            result = await db.execute(
+                select(ProductModel, active_cart_id)
+                .where(ProductModel.id == product_id)
+                .with_for_update(read=True, of=ProductModel)
+            )
+            row = result.one_or_none()
+            if not row:
                 raise ValueError(f"Product {product_id} not found")
+            product, cart_id = row
 
             if not product.is_active:
                 raise ValueError(f"Product {product.name} is not active")
@@ -176,41 +184,47 @@ class CartService:
             if product.stock_quantity < quantity:
                 raise ValueError(f"Insufficient stock for product {product.name}")
 
-            # Check if item already in cart
-            existing_item = await db.execute(
-                select(CartItemModel).where(
-                    and_(
-                        CartItemModel.cart_id == cart.id,
-                        CartItemModel.product_id == product_id
-                    )
-                )
+            # Create the cart on first add
+            if not cart_id:
+                cart = CartModel(session_id=session_id, status=CartStatus.ACTIVE)
+                db.add(cart)
+                await db.flush()
+                cart_id = cart.id
+
+            # Insert the item, or add to its quantity if it is already in the cart.
+            # The conflict update only applies while the total stays within stock,
+            # and the cart timestamp is touched in the same statement.
+            insert_stmt = insert(CartItemModel).values(
+                cart_id=cart_id,
+                product_id=product_id,
+                quantity=quantity,
+                unit_price=product.price_per_unit
             )
-            existing_item = existing_item.scalar_one_or_none()
-
-            if existing_item:
-                # Update existing item
-                new_quantity = existing_item.quantity + quantity
-                if product.stock_quantity < new_quantity:
-                    raise ValueError(f"Insufficient stock for product {product.name}")
-
-                existing_item.quantity = new_quantity
-                existing_item.updated_at = datetime.now(UTC)
-            else:
-                # Create new cart item
-                cart_item = CartItemModel(
-                    cart_id=cart.id,
-                    product_id=product_id,
-                    quantity=quantity,
-                    unit_price=product.price_per_unit
+            new_quantity = CartItemModel.quantity + insert_stmt.excluded.quantity
+            upserted_item = (
+                insert_stmt.on_conflict_do_update(
+                    index_elements=[CartItemModel.cart_id, CartItemModel.product_id],
+                    set_={"quantity": new_quantity, "updated_at": func.now()},
+                    where=new_quantity <= product.stock_quantity
                 )
-                db.add(cart_item)
+                .returning(CartItemModel.cart_id)
+                .cte("upserted_item")
+            )
+            result = await db.execute(
+                update(CartModel)
+                .where(CartModel.id == upserted_item.c.cart_id)
+                .values(updated_at=func.now())
+                .returning(CartModel.id)
+                .execution_options(synchronize_session=False)
+            )
+            if result.scalar_one_or_none() is None:
+                raise ValueError(f"Insufficient stock for product {product.name}")
 
-            # Update cart timestamp
-            cart.updated_at = datetime.now(UTC)
             await db.commit()
+            await response_cache.bump_version(CART_LIST_NAMESPACE)
 
             # Return updated cart with items
-            return await CartService.get_cart(db, cart.id)
+            return await CartService.get_cart(db, cart_id)
 
         except Exception as e:
             await db.rollback()
@@ -224,32 +238,48 @@ class CartService:
     ) -> Optional[CartModel]:
         """Update cart item quantity."""
         try:
-            # Get cart item
-            cart_item = await db.get(CartItemModel, cart_item_id)
-            if not cart_item:
-                return None
-
-            # Get product to check stock
-            product = await db.get(ProductModel, cart_item.product_id)
-            if not product:
-                raise ValueError("Product not found")
-
-            if product.stock_quantity < quantity:
-                raise ValueError(f"Insufficient stock for product {product.name}")
-
-            # Update quantity
-            cart_item.quantity = quantity
-            cart_item.updated_at = datetime.now(UTC)
-
-            # Update cart timestamp
-            cart = await db.get(CartModel, cart_item.cart_id)
-            if cart:
-                cart.updated_at = datetime.now(UTC)
+            # Set the quantity only while the product has enough stock, and
+            # touch the owning cart in the same statement
+            updated_item = (
+                update(CartItemModel)
+                .where(and_(
+                    CartItemModel.id == cart_item_id,
+                    CartItemModel.product_id == ProductModel.id,
+                    ProductModel.stock_quantity >= quantity
+                ))
+                .values(quantity=quantity, updated_at=func.now())
+                .returning(CartItemModel.cart_id)
+                .cte("updated_item")
+            )
+            result = await db.execute(
+                update(CartModel)
+                .where(CartModel.id == updated_item.c.cart_id)
+                .values(updated_at=func.now())
+                .returning(CartModel.id)
+                .execution_options(synchronize_session=False)
+            )
+            cart_id = result.scalar_one_or_none()
+
+            if not cart_id:
+                await db.rollback()
+                # Nothing was updated; find out why
+                result = await db.execute(
+                    select(CartItemModel.id, ProductModel.name)
+                    .outerjoin(ProductModel, ProductModel.id == CartItemModel.product_id)
+                    .where(CartItemModel.id == cart_item_id)
+                )
+                row = result.one_or_none()
+                if not row:
+                    return None
+                if row.name is None:
+                    raise ValueError("Product not found")
+                raise ValueError(f"Insufficient stock for product {row.name}")
 
             await db.commit()
+            await response_cache.bump_version(CART_LIST_NAMESPACE)
 
             # Return updated cart
-            return await CartService.get_cart(db, cart_item.cart_id)
+            return await CartService.get_cart(db, cart_id)
 
         except Exception as e:
             await db.rollback()
@@ -262,22 +292,27 @@ class CartService:
     ) -> Optional[CartModel]:
         """Remove item from cart."""
         try:
-            # Get cart item
-            cart_item = await db.get(CartItemModel, cart_item_id)
-            if not cart_item:
+            # Delete the item and touch its cart in one statement
+            removed_item = (
+                delete(CartItemModel)
+                .where(CartItemModel.id == cart_item_id)
+                .returning(CartItemModel.cart_id)
+                .cte("removed_item")
+            )
+            result = await db.execute(
+                update(CartModel)
+                .where(CartModel.id == removed_item.c.cart_id)
+                .values(updated_at=func.now())
+                .returning(CartModel.id)
+                .execution_options(synchronize_session=False)
+            )
+            cart_id = result.scalar_one_or_none()
+            if not cart_id:
+                await db.rollback()
                 return None
 
-            cart_id = cart_item.cart_id
-
-            # Delete cart item
-            await db.delete(cart_item)
-
-            # Update cart timestamp
-            cart = await db.get(CartModel, cart_id)
-            if cart:
-                cart.updated_at = datetime.now(UTC)
-
             await db.commit()
+            await response_cache.bump_version(CART_LIST_NAMESPACE)
 
             # Return updated cart
             return await CartService.get_cart(db, cart_id)
@@ -290,18 +325,27 @@ class CartService:
     async def clear_cart(db: AsyncSession, session_id: str) -> bool:
         """Clear all items from cart."""
         try:
-            cart = await CartService.get_cart_by_session(db, session_id)
-            if not cart:
-                return False
-
-            # Delete all cart items
-            await db.execute(
-                delete(CartItemModel).where(CartItemModel.cart_id == cart.id)
+            # Delete the active cart's items and touch the cart in one statement
+            active_cart = and_(CartModel.session_id == session_id, CartModel.status == CartStatus.ACTIVE)
+            removed_items = (
+                delete(CartItemModel)
+                .where(CartItemModel.cart_id.in_(select(CartModel.id).where(active_cart)))
+                .cte("removed_items")
             )
+            result = await db.execute(
+                update(CartModel)
+                .where(active_cart)
+                .values(updated_at=func.now())
+                .returning(CartModel.id)
+                .add_cte(removed_items)
+                .execution_options(synchronize_session=False)
+            )
+            if result.first() is None:
+                await db.rollback()
+                return False
 
-            # Update cart timestamp
-            cart.updated_at = datetime.now(UTC)
             await db.commit()
+            await response_cache.bump_version(CART_LIST_NAMESPACE)
 
             return True
 
@@ -310,12 +354,8 @@ class CartService:
             return False
 
     @staticmethod
-    async def get_cart_totals(db: AsyncSession, cart_id: UUID) -> dict:
-        """Calculate cart totals."""
-        cart = await CartService.get_cart(db, cart_id)
-        if not cart:
-            return {"total": 0, "item_count": 0}
-
+    def calculate_totals(cart: CartModel) -> dict:
+        """Calculate totals from a cart whose items are already loaded."""
         total = Decimal('0')
         item_count = 0
 
@@ -324,7 +364,7 @@ class CartService:
             item_count += 1
 
         return {
-            "total": float(total),
+            "total": total,
             "item_count": item_count
         }
 
@@ -334,13 +374,20 @@ class CartService:
         cart_id: UUID
     ) -> Optional[CartModel]:
         """Mark cart as converted to order."""
-        cart = await CartService.get_cart(db, cart_id)
+        stmt = (
+            update(CartModel)
+            .where(CartModel.id == cart_id)
+            .values(status=CartStatus.CONVERTED, updated_at=func.now())
+            .returning(CartModel)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await db.execute(stmt)
+        cart = result.scalar_one_or_none()
         if not cart:
+            await db.rollback()
             return None
 
-        cart.status = CartStatus.CONVERTED
-        cart.updated_at = datetime.utcnow()
         await db.commit()
-        await db.refresh(cart)
+        await response_cache.bump_version(CART_LIST_NAMESPACE)
 
         return cart
\ No newline at end of file
@@ -19,6 +19,10 @@ class CustomerBase(BaseModel):
     country: str = Field(default="Israel", description="Country")
     marketing_opt_in: bool = Field(default=False, description="Whether customer opted in for marketing")
 
+    class Config:
+        # Instances are only built and serialized, never mutated
+        frozen = True
+
 
 class CustomerCreate(CustomerBase):
     """Model for creating a new customer."""
@@ -52,6 +56,7 @@ class Customer(CustomerBase):
 class CustomerList(BaseModel):
     """Model for customer list responses."""
     customers: list[Customer]
-    total: int = Field(..., description="Total number of customers")
+    total: int = Field(..., description="Total number of customers; estimated for searches unless exact_count is set")
     page: int = Field(default=1, description="Current page number")
-    size: int = Field(default=50, description="Number of items per page")
\ No newline at end of file
+    size: int = Field(default=50, description="Number of items per page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if there is one")
\ No newline at end of file
@@ -1,10 +1,13 @@
 """Customers service routes."""
 
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
+from api.cache import CUSTOMER_LIST_NAMESPACE, LIST_CACHE_TTL_SECONDS, response_cache
+from api.pagination import decode_cursor, next_cursor
+from api.responses import ORJSONResponse, dump_json
 from packages.db.session import get_async_db
 from .models import Customer, CustomerCreate, CustomerUpdate, CustomerList
 from .service import CustomerService
@@ -13,22 +16,38 @@ router = APIRouter()
 
 @router.get("/", response_model=CustomerList)
 async def get_customers(
+    request: Request,
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(50, ge=1, le=100, description="Number of items per page"),
     marketing_opt_in: Optional[bool] = Query(None, description="Filter by marketing opt-in status"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides page"),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get all customers with pagination and filtering."""
+    # Served from the list cache until a customer changes or the entry expires
+    cache_key = await response_cache.versioned_key(CUSTOMER_LIST_NAMESPACE, request.url.query)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     skip = (page - 1) * size
     customers, total = await CustomerService.get_customers(
-        db=db, skip=skip, limit=size, marketing_opt_in=marketing_opt_in
+        db=db, skip=skip, limit=size, marketing_opt_in=marketing_opt_in, after=after
     )
-    return CustomerList(
+    body = dump_json(CustomerList(
         customers=customers,
         total=total,
         page=page,
-        size=size
-    )
+        size=size,
+        next_cursor=next_cursor(customers, size, "created_at")
+    ).model_dump())
+    await response_cache.set(cache_key, body, LIST_CACHE_TTL_SECONDS)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{customer_id}", response_model=Customer)
@@ -37,10 +56,10 @@ async def get_customer(
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific customer by ID."""
-    customer = await CustomerService.get_customer(db, customer_id)
-    if not customer:
+    body = await CustomerService.get_customer_json(db, customer_id)
+    if body is None:
         raise HTTPException(status_code=404, detail="Customer not found")
-    return customer
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/", response_model=Customer, status_code=201)
@@ -50,7 +69,8 @@ async def create_customer(
 ):
     """Create a new customer."""
     try:
-        return await CustomerService.create_customer(db, customer)
+        db_customer = await CustomerService.create_customer(db, customer)
+        return ORJSONResponse(content=Customer.model_validate(db_customer).model_dump(), status_code=201)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -66,7 +86,7 @@ async def update_customer(
         customer = await CustomerService.update_customer(db, customer_id, customer_update)
         if not customer:
             raise HTTPException(status_code=404, detail="Customer not found")
-        return customer
+        return ORJSONResponse(content=Customer.model_validate(customer).model_dump())
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -84,22 +104,31 @@ async def delete_customer(
 
 @router.get("/search/", response_model=CustomerList)
 async def search_customers(
+    request: Request,
     q: str = Query(..., description="Search term"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(50, ge=1, le=100, description="Number of items per page"),
+    exact_count: bool = Query(False, description="Count matches exactly instead of estimating the total"),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Search customers by name or email."""
+    cache_key = await response_cache.versioned_key(CUSTOMER_LIST_NAMESPACE, f"search:{request.url.query}")
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     skip = (page - 1) * size
     customers, total = await CustomerService.search_customers(
-        db=db, search_term=q, skip=skip, limit=size
+        db=db, search_term=q, skip=skip, limit=size, exact_count=exact_count
     )
-    return CustomerList(
+    body = dump_json(CustomerList(
         customers=customers,
         total=total,
         page=page,
         size=size
-    )
+    ).model_dump())
+    await response_cache.set(cache_key, body, LIST_CACHE_TTL_SECONDS)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{customer_id}/orders", response_model=Customer)
@@ -111,4 +140,4 @@ async def get_customer_with_orders(
     customer = await CustomerService.get_customer_with_orders(db, customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
-    return customer
\ No newline at end of file
+    return ORJSONResponse(content=Customer.model_validate(customer).model_dump())
\ No newline at end of file
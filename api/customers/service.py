@@ -1,14 +1,34 @@
 """Customers service layer for database operations."""
 
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
-from sqlalchemy.orm import selectinload
-import bcrypt
+from sqlalchemy import select, update, delete, bindparam, literal_column, tuple_
+from sqlalchemy.orm import selectinload, load_only
 
+from api.auth.service import AuthService
+from api.cache import CUSTOMER_LIST_NAMESPACE, CUSTOMER_NAMESPACE, response_cache
+from api.pagination import contains_pattern, fetch_page
+from api.responses import dump_json
 from packages.db.models import Customer as CustomerModel
-from .models import CustomerCreate, CustomerUpdate
+from .models import Customer, CustomerCreate, CustomerUpdate
+
+# Single-row lookups are built once so each call reuses the cached compilation
+_GET_CUSTOMER_STMT = select(CustomerModel).where(CustomerModel.id == bindparam("customer_id"))
+_GET_CUSTOMER_BY_EMAIL_STMT = select(CustomerModel).where(CustomerModel.email == bindparam("email"))
+
+# List pages load only the columns the Customer response schema serializes,
+# which leaves out password_hash
+_CUSTOMER_RESPONSE_COLUMNS = load_only(*(getattr(CustomerModel, field) for field in Customer.model_fields))
+
+# Same expression as idx_customer_search_trgm, so searches can use the trigram index.
+# Built once; each search only supplies the "pattern" value.
+_CUSTOMER_SEARCH_FILTER = (
+    CustomerModel.first_name + literal_column("' '") +
+    CustomerModel.last_name + literal_column("' '") +
+    CustomerModel.email
+).ilike(bindparam("pattern"), escape="\\")
 
 
 class CustomerService:
@@ -19,41 +39,56 @@ class CustomerService:
         db: AsyncSession,
         skip: int = 0,
         limit: int = 50,
-        marketing_opt_in: Optional[bool] = None
+        marketing_opt_in: Optional[bool] = None,
+        after: Optional[tuple[datetime, UUID]] = None
     ) -> tuple[List[CustomerModel], int]:
-        """Get customers with pagination and filtering."""
-        query = select(CustomerModel)
+        """Get customers with pagination and filtering.
 
-        if marketing_opt_in is not None:
-            query = query.where(CustomerModel.marketing_opt_in == marketing_opt_in)
+        When ``after`` (the last seen ``(created_at, id)``) is given, the page
+        starts right after that row and ``skip`` is ignored.
+        """
+        query = select(CustomerModel).options(_CUSTOMER_RESPONSE_COLUMNS)
+        filters = []
 
-        # Get total count
-        count_query = select(CustomerModel.id)
         if marketing_opt_in is not None:
-            count_query = count_query.where(CustomerModel.marketing_opt_in == marketing_opt_in)
+            filters.append(CustomerModel.marketing_opt_in == marketing_opt_in)
+            query = query.where(*filters)
 
-        total_result = await db.execute(count_query)
-        total = len(total_result.fetchall())
+        if after is not None:
+            query = query.where(tuple_(CustomerModel.created_at, CustomerModel.id) < after)
+        else:
+            query = query.offset(skip)
 
-        # Get paginated results
-        query = query.offset(skip).limit(limit).order_by(CustomerModel.created_at.desc())
-        result = await db.execute(query)
-        customers = result.scalars().all()
-
-        return customers, total
+        # Get paginated results and total count
+        query = query.limit(limit).order_by(CustomerModel.created_at.desc(), CustomerModel.id.desc())
+        return await fetch_page(db, CustomerModel, query, filters)
 
     @staticmethod
     async def get_customer(db: AsyncSession, customer_id: UUID) -> Optional[CustomerModel]:
         """Get a customer by ID."""
-        query = select(CustomerModel).where(CustomerModel.id == customer_id)
-        result = await db.execute(query)
+        result = await db.execute(_GET_CUSTOMER_STMT, {"customer_id": customer_id})
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def get_customer_json(db: AsyncSession, customer_id: UUID) -> Optional[bytes]:
+        """Get a customer as JSON bytes, served from the response cache when possible."""
+        key = f"{CUSTOMER_NAMESPACE}:{customer_id}"
+        cached = await response_cache.get(key)
+        if cached is not None:
+            return cached
+
+        customer = await CustomerService.get_customer(db, customer_id)
+        if not customer:
+            return None
+
+        body = dump_json(Customer.model_validate(customer).model_dump())
+        await response_cache.set(key, body)
+        return body
+
     @staticmethod
     async def get_customer_by_email(db: AsyncSession, email: str) -> Optional[CustomerModel]:
         """Get a customer by email."""
-        query = select(CustomerModel).where(CustomerModel.email == email)
-        result = await db.execute(query)
+        result = await db.execute(_GET_CUSTOMER_BY_EMAIL_STMT, {"email": email})
         return result.scalar_one_or_none()
 
     @staticmethod
@@ -78,6 +113,7 @@ class CustomerService:
         db_customer = CustomerModel(**customer_data.model_dump())
         db.add(db_customer)
         await db.commit()
+        await response_cache.bump_version(CUSTOMER_LIST_NAMESPACE)
         await db.refresh(db_customer)
         return db_customer
 
@@ -109,6 +145,8 @@ class CustomerService:
             )
             await db.execute(stmt)
             await db.commit()
+            await response_cache.bump_version(CUSTOMER_LIST_NAMESPACE)
+            await response_cache.delete(f"{CUSTOMER_NAMESPACE}:{customer_id}")
             await db.refresh(customer)
 
         return customer
@@ -123,6 +161,8 @@ class CustomerService:
         stmt = delete(CustomerModel).where(CustomerModel.id == customer_id)
         await db.execute(stmt)
         await db.commit()
+        await response_cache.bump_version(CUSTOMER_LIST_NAMESPACE)
+        await response_cache.delete(f"{CUSTOMER_NAMESPACE}:{customer_id}")
         return True
 
     @staticmethod
@@ -130,72 +170,29 @@ class CustomerService:
         db: AsyncSession,
         search_term: str,
         skip: int = 0,
-        limit: int = 50
+        limit: int = 50,
+        exact_count: bool = False
     ) -> tuple[List[CustomerModel], int]:
-        """Search customers by name or email."""
-        query = select(CustomerModel).where(
-            (CustomerModel.first_name.ilike(f"%{search_term}%")) |
-            (CustomerModel.last_name.ilike(f"%{search_term}%")) |
-            (CustomerModel.email.ilike(f"%{search_term}%"))
-        )
-
-        # Get total count
-        count_query = select(CustomerModel.id).where(
-            (CustomerModel.first_name.ilike(f"%{search_term}%")) |
-            (CustomerModel.last_name.ilike(f"%{search_term}%")) |
-            (CustomerModel.email.ilike(f"%{search_term}%"))
-        )
+        """Search customers by name or email.
 
-        total_result = await db.execute(count_query)
-        total = len(total_result.fetchall())
+        The total is the planner's estimate unless ``exact_count`` is set.
+        """
+        query = select(CustomerModel).where(_CUSTOMER_SEARCH_FILTER).options(_CUSTOMER_RESPONSE_COLUMNS)
 
-        # Get paginated results
+        # Get paginated results and total count
         query = query.offset(skip).limit(limit).order_by(CustomerModel.created_at.desc())
-        result = await db.execute(query)
-        customers = result.scalars().all()
-
-        return customers, total
+        return await fetch_page(
+            db, CustomerModel, query, [_CUSTOMER_SEARCH_FILTER], {"pattern": contains_pattern(search_term)},
+            exact_count=exact_count, skip=skip, limit=limit
+        )
 
     @staticmethod
     async def authenticate_customer(db: AsyncSession, email: str, password: str) -> Optional[CustomerModel]:
         """Authenticate customer by email and password."""
-        customer = await CustomerService.get_customer_by_email(db, email)
-
-        if customer and customer.password_hash:
-            # Verify password using bcrypt
-            if bcrypt.checkpw(password.encode('utf-8'), customer.password_hash.encode('utf-8')):
-                return customer
-
-        return None
+        # AuthService verifies bcrypt hashes on a worker thread, off the event loop
+        return await AuthService.authenticate_customer(db, email, password)
 
     @staticmethod
     async def register_customer(db: AsyncSession, register_data) -> CustomerModel:
         """Register a new customer with hashed password."""
-        # Check if email already exists
-        existing_customer = await CustomerService.get_customer_by_email(db, register_data.email)
-        if existing_customer:
-            raise ValueError("Customer with this email already exists")
-
-        # Hash the password
-        password_hash = bcrypt.hashpw(register_data.password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-
-        # Create customer data
-        customer_data = {
-            'first_name': register_data.first_name,
-            'last_name': register_data.last_name,
-            'email': register_data.email,
-            'password_hash': password_hash,
-            'phone': register_data.phone,
-            'address_line1': register_data.address_line1,
-            'address_line2': register_data.address_line2,
-            'city': register_data.city,
-            'postal_code': register_data.postal_code,
-            'country': register_data.country,
-            'marketing_opt_in': False
-        }
-
-        db_customer = CustomerModel(**customer_data)
-        db.add(db_customer)
-        await db.commit()
-        await db.refresh(db_customer)
-        return db_customer
\ No newline at end of file
+        return await AuthService.register_customer(db, register_data)
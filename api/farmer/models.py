@@ -19,6 +19,10 @@ class FarmerBase(BaseModel):
     country: str = Field(default="Israel", description="Country")
     is_active: bool = Field(default=True, description="Whether the farmer account is active")
 
+    class Config:
+        # Instances are only built and serialized, never mutated
+        frozen = True
+
 
 class FarmerCreate(FarmerBase):
     """Model for creating a new farmer."""
@@ -1,29 +1,51 @@
 """Farmer service routes - Single Farmer Model."""
 
+from datetime import datetime
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
+from api.cache import FARMER_NAMESPACE, response_cache
+from api.responses import (
+    PUBLIC_CACHE_CONTROL, conditional_body_response, conditional_json_response, conditional_row_response, dump_json
+)
 from packages.db.session import get_async_db
 from .models import Farmer, FarmerCreate, FarmerUpdate, FarmerList
 from .service import FarmerService
 
 router = APIRouter()
 
+# Entries are b"<id>|<updated_at>\n" followed by the serialized Farmer
+ADMIN_FARMER_PROFILE_CACHE_KEY = f"{FARMER_NAMESPACE}:admin_profile_response"
+
 @router.get("/admin", response_model=Farmer)
 async def get_admin_farmer(
+    request: Request,
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get the admin farmer (single farmer model)."""
-    farmer = await FarmerService.get_admin_farmer(db)
-    if not farmer:
-        raise HTTPException(status_code=404, detail="Admin farmer not found")
-    return farmer
+    # Effectively fixed per deployment; cleared whenever a farmer changes
+    cached = await response_cache.get(ADMIN_FARMER_PROFILE_CACHE_KEY)
+    if cached is None:
+        farmer = await FarmerService.get_admin_farmer(db)
+        if not farmer:
+            raise HTTPException(status_code=404, detail="Admin farmer not found")
+        validators = f"{farmer.id}|{farmer.updated_at.isoformat()}\n".encode()
+        cached = validators + dump_json(Farmer.model_validate(farmer).model_dump())
+        await response_cache.set(ADMIN_FARMER_PROFILE_CACHE_KEY, cached)
+
+    # Hits are answered from the stored bytes, without Pydantic
+    validators, body = cached.split(b"\n", 1)
+    farmer_id, updated_at = validators.decode().split("|")
+    return conditional_body_response(
+        request, farmer_id, datetime.fromisoformat(updated_at), body, cache_control=PUBLIC_CACHE_CONTROL
+    )
 
 
 @router.get("/{farmer_id}", response_model=Farmer)
 async def get_farmer(
+    request: Request,
     farmer_id: UUID,
     db: AsyncSession = Depends(get_async_db)
 ):
@@ -31,7 +53,7 @@ async def get_farmer(
     farmer = await FarmerService.get_farmer(db, farmer_id)
     if not farmer:
         raise HTTPException(status_code=404, detail="Farmer not found")
-    return farmer
+    return conditional_row_response(request, farmer, Farmer, cache_control=PUBLIC_CACHE_CONTROL)
 
 
 @router.post("/", response_model=Farmer, status_code=201)
@@ -69,6 +91,7 @@ async def delete_farmer(
 
 @router.get("/search/", response_model=FarmerList)
 async def search_farmers(
+    request: Request,
     q: str = Query(..., description="Search term"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(50, ge=1, le=100, description="Number of items per page"),
@@ -79,9 +102,9 @@ async def search_farmers(
     farmers, total = await FarmerService.search_farmers(
         db=db, search_term=q, skip=skip, limit=size
     )
-    return FarmerList(
+    return conditional_json_response(request, FarmerList(
         farmers=farmers,
         total=total,
         page=page,
         size=size
-    )
\ No newline at end of file
+    ).model_dump(), max_age=0)
\ No newline at end of file
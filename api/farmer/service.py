@@ -3,13 +3,20 @@
 from typing import List, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, func
+from sqlalchemy import select, update, delete, bindparam, literal_column
 from sqlalchemy.orm import selectinload
-import bcrypt
 
+from api.auth.service import AuthService
+from api.cache import FARMER_NAMESPACE, response_cache
+from api.pagination import contains_pattern, fetch_page
 from packages.db.models import Farmer as FarmerModel
 from .models import FarmerCreate, FarmerUpdate
 
+# One ILIKE over the concatenated fields, served by idx_farmer_search_trgm
+_FARMER_SEARCH_FILTER = (
+    FarmerModel.name + literal_column("' '") + FarmerModel.farm_name + literal_column("' '") + FarmerModel.email
+).ilike(bindparam("pattern"), escape="\\")
+
 
 class FarmerService:
     """Service class for farmer-related database operations."""
@@ -23,24 +30,15 @@ class FarmerService:
     ) -> tuple[List[FarmerModel], int]:
         """Get farmers with pagination and filtering."""
         query = select(FarmerModel)
+        filters = []
 
         if is_active is not None:
-            query = query.where(FarmerModel.is_active == is_active)
-
-        # Get total count
-        count_query = select(FarmerModel.id)
-        if is_active is not None:
-            count_query = count_query.where(FarmerModel.is_active == is_active)
-
-        total_result = await db.execute(count_query)
-        total = len(total_result.fetchall())
+            filters.append(FarmerModel.is_active == is_active)
+            query = query.where(*filters)
 
-        # Get paginated results
+        # Get paginated results and total count
         query = query.offset(skip).limit(limit).order_by(FarmerModel.created_at.desc())
-        result = await db.execute(query)
-        farmers = result.scalars().all()
-
-        return farmers, total
+        return await fetch_page(db, FarmerModel, query, filters)
 
     @staticmethod
     async def get_farmer(db: AsyncSession, farmer_id: UUID) -> Optional[FarmerModel]:
@@ -66,6 +64,7 @@ class FarmerService:
         db_farmer = FarmerModel(**farmer_data.model_dump())
         db.add(db_farmer)
         await db.commit()
+        await response_cache.invalidate(FARMER_NAMESPACE)
         await db.refresh(db_farmer)
         return db_farmer
 
@@ -76,36 +75,38 @@ class FarmerService:
         farmer_update: FarmerUpdate
     ) -> Optional[FarmerModel]:
         """Update a farmer."""
-        # Get the farmer first
-        farmer = await FarmerService.get_farmer(db, farmer_id)
-        if not farmer:
-            return None
-
         # Update only provided fields
         update_data = farmer_update.model_dump(exclude_unset=True)
-        if update_data:
-            stmt = (
-                update(FarmerModel)
-                .where(FarmerModel.id == farmer_id)
-                .values(**update_data)
-            )
-            await db.execute(stmt)
-            await db.commit()
-            await db.refresh(farmer)
+        if not update_data:
+            return await FarmerService.get_farmer(db, farmer_id)
+
+        stmt = (
+            update(FarmerModel)
+            .where(FarmerModel.id == farmer_id)
+            .values(**update_data)
+            .returning(FarmerModel)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await db.execute(stmt)
+        farmer = result.scalar_one_or_none()
+        if not farmer:
+            await db.rollback()
+            return None
 
+        await db.commit()
+        await response_cache.invalidate(FARMER_NAMESPACE)
         return farmer
 
     @staticmethod
     async def delete_farmer(db: AsyncSession, farmer_id: UUID) -> bool:
         """Delete a farmer."""
-        farmer = await FarmerService.get_farmer(db, farmer_id)
-        if not farmer:
-            return False
-
-        stmt = delete(FarmerModel).where(FarmerModel.id == farmer_id)
-        await db.execute(stmt)
+        stmt = delete(FarmerModel).where(FarmerModel.id == farmer_id).returning(FarmerModel.id)
+        result = await db.execute(stmt)
+        deleted = result.scalar_one_or_none() is not None
         await db.commit()
-        return True
+        if deleted:
+            await response_cache.invalidate(FARMER_NAMESPACE)
+        return deleted
 
     @staticmethod
     async def search_farmers(
@@ -115,28 +116,13 @@ class FarmerService:
         limit: int = 50
     ) -> tuple[List[FarmerModel], int]:
         """Search farmers by name, farm_name, or email."""
-        query = select(FarmerModel).where(
-            (FarmerModel.name.ilike(f"%{search_term}%")) |
-            (FarmerModel.farm_name.ilike(f"%{search_term}%")) |
-            (FarmerModel.email.ilike(f"%{search_term}%"))
-        )
+        query = select(FarmerModel).where(_FARMER_SEARCH_FILTER)
 
-        # Get total count
-        count_query = select(FarmerModel.id).where(
-            (FarmerModel.name.ilike(f"%{search_term}%")) |
-            (FarmerModel.farm_name.ilike(f"%{search_term}%")) |
-            (FarmerModel.email.ilike(f"%{search_term}%"))
-        )
-
-        total_result = await db.execute(count_query)
-        total = len(total_result.fetchall())
-
-        # Get paginated results
+        # Get paginated results and total count
         query = query.offset(skip).limit(limit).order_by(FarmerModel.created_at.desc())
-        result = await db.execute(query)
-        farmers = result.scalars().all()
-
-        return farmers, total
+        return await fetch_page(
+            db, FarmerModel, query, [_FARMER_SEARCH_FILTER], {"pattern": contains_pattern(search_term)}
+        )
 
     @staticmethod
     async def get_admin_farmer(db: AsyncSession) -> Optional[FarmerModel]:
@@ -148,16 +134,5 @@ class FarmerService:
     @staticmethod
     async def authenticate_farmer(db: AsyncSession, email: str, password: str) -> Optional[FarmerModel]:
         """Authenticate farmer by email and password."""
-        query = select(FarmerModel).where(
-            FarmerModel.email == email,
-            FarmerModel.is_active == True
-        )
-        result = await db.execute(query)
-        farmer = result.scalar_one_or_none()
-
-        if farmer and farmer.password_hash:
-            # Verify password using bcrypt
-            if bcrypt.checkpw(password.encode('utf-8'), farmer.password_hash.encode('utf-8')):
-                return farmer
-
-        return None
\ No newline at end of file
+        # AuthService verifies bcrypt hashes on a worker thread, off the event loop
+        return await AuthService.authenticate_farmer(db, email, password)
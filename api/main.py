@@ -5,8 +5,13 @@ This module creates the FastAPI application instance, configures middleware,
 and includes all service routers.
 """
 
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+
+from api.responses import ORJSONResponse
 
 # Import service routers
 from api.auth.routes import router as auth_router
@@ -26,71 +31,50 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
-# Configure CORS middleware
+# Compress larger JSON payloads (analytics, listings)
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
+# Browsers refuse credentialed responses for a wildcard origin, so origins
+# are always listed explicitly
+ALLOWED_ORIGINS = [
+    origin.strip() for origin in os.getenv("ALLOWED_ORIGINS", "http://localhost:8501").split(",")
+    if origin.strip()
+]
+if "*" in ALLOWED_ORIGINS:
+    raise RuntimeError("ALLOWED_ORIGINS must list explicit origins; '*' cannot be used with credentials")
+
+# Configure CORS middleware. Added last so it is the outermost layer and
+# answers preflights before anything else runs; explicit lists and a long
+# max_age let browsers cache the preflight result.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure this properly in production
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=os.getenv("ALLOWED_METHODS", "GET,POST,PUT,DELETE,OPTIONS").split(","),
+    allow_headers=os.getenv(
+        "ALLOWED_HEADERS", "Authorization,Content-Type,If-None-Match,If-Modified-Since"
+    ).split(","),
+    max_age=int(os.getenv("CORS_MAX_AGE", "86400")),
 )
 
-# Include service routers
-app.include_router(
-    auth_router,
-    prefix="/api/auth",
-    tags=["auth"]
+# Include service routers: (router, mount prefix, OpenAPI tag)
+ROUTERS = (
+    (auth_router, "/api/auth", "auth"),
+    (farmer_router, "/api/farmer", "farmer"),
+    (customers_router, "/api/customers", "customers"),
+    (products_router, "/api/products", "products"),
+    (orders_router, "/api/orders", "orders"),
+    (shipments_router, "/api/shipments", "shipments"),
+    (cart_router, "/api", "cart"),
+    (analytics_router, "/api", "analytics"),
+    (payments_router, "/api/payments", "payments"),
 )
 
-app.include_router(
-    farmer_router,
-    prefix="/api/farmer",
-    tags=["farmer"]
-)
-
-app.include_router(
-    customers_router,
-    prefix="/api/customers",
-    tags=["customers"]
-)
-
-app.include_router(
-    products_router,
-    prefix="/api/products",
-    tags=["products"]
-)
-
-app.include_router(
-    orders_router,
-    prefix="/api/orders",
-    tags=["orders"]
-)
-
-app.include_router(
-    shipments_router,
-    prefix="/api/shipments",
-    tags=["shipments"]
-)
-
-app.include_router(
-    cart_router,
-    prefix="/api",
-    tags=["cart"]
-)
-
-app.include_router(
-    analytics_router,
-    prefix="/api",
-    tags=["analytics"]
-)
-
-app.include_router(
-    payments_router,
-    prefix="/api/payments",
-    tags=["payments"]
-)
+for router, prefix, tag in ROUTERS:
+    app.include_router(router, prefix=prefix, tags=[tag])
 
 # Root endpoint
 @app.get("/")
@@ -4,12 +4,9 @@ from datetime import datetime
 from typing import Optional, List
 from uuid import UUID
 from decimal import Decimal
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field
 
 # Import centralized enums
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 from packages.db.enums import OrderStatus, PaymentStatus
 
 
@@ -108,7 +105,11 @@ class Order(OrderBase):
     updated_at: datetime = Field(..., description="Timestamp when the order was last updated")
 
     # Related items
-    items: Optional[List[OrderItem]] = Field(None, description="Order items")
+    items: Optional[List[OrderItem]] = Field(
+        None,
+        validation_alias=AliasChoices("items", "order_items"),
+        description="Order items"
+    )
 
     class Config:
         from_attributes = True
@@ -120,6 +121,7 @@ class OrderList(BaseModel):
     total: int = Field(..., description="Total number of orders")
     page: int = Field(default=1, description="Current page number")
     size: int = Field(default=50, description="Number of items per page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if there is one")
 
 
 class OrderSummary(BaseModel):
@@ -134,4 +136,13 @@ class OrderSummary(BaseModel):
     created_at: datetime = Field(..., description="Order creation date")
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class OrderSummaryList(BaseModel):
+    """Model for order list responses without items or shipping details."""
+    orders: List[OrderSummary]
+    total: int = Field(..., description="Total number of orders")
+    page: int = Field(default=1, description="Current page number")
+    size: int = Field(default=50, description="Number of items per page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if there is one")
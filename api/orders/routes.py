@@ -1,44 +1,63 @@
 """Orders service routes."""
 
+from datetime import datetime
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from typing import Optional, Union
 
+from api.pagination import decode_cursor, next_cursor
+from api.responses import conditional_json_response, conditional_row_response
 from packages.db.session import get_async_db
 from packages.db.models import OrderStatus, PaymentStatus
-from .models import Order, OrderCreate, OrderUpdate, OrderList, OrderSummary
+from .models import Order, OrderCreate, OrderUpdate, OrderList, OrderSummary, OrderSummaryList
 from .service import OrderService
 
 router = APIRouter()
 
 
-@router.get("/", response_model=OrderList)
+def _decode_cursor(cursor: Optional[str]) -> Optional[tuple[datetime, UUID]]:
+    """Parse an optional list cursor, rejecting malformed ones with a 400."""
+    try:
+        return decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/", response_model=Union[OrderList, OrderSummaryList])
 async def get_orders(
+    request: Request,
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(50, ge=1, le=100, description="Number of items per page"),
     customer_id: Optional[UUID] = Query(None, description="Filter by customer ID"),
     farmer_id: Optional[UUID] = Query(None, description="Filter by farmer ID"),
     status: Optional[OrderStatus] = Query(None, description="Filter by order status"),
     payment_status: Optional[PaymentStatus] = Query(None, description="Filter by payment status"),
+    summary: bool = Query(False, description="Return OrderSummary rows without items"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides page"),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get all orders with pagination and filtering."""
+    after = _decode_cursor(cursor)
     skip = (page - 1) * size
     orders, total = await OrderService.get_orders(
         db=db, skip=skip, limit=size, customer_id=customer_id,
-        farmer_id=farmer_id, status=status, payment_status=payment_status
+        farmer_id=farmer_id, status=status, payment_status=payment_status,
+        summary=summary, after=after
     )
-    return OrderList(
+    list_model = OrderSummaryList if summary else OrderList
+    return conditional_json_response(request, list_model(
         orders=orders,
         total=total,
         page=page,
-        size=size
-    )
+        size=size,
+        next_cursor=next_cursor(orders, size, "created_at")
+    ).model_dump(), max_age=0)
 
 
 @router.get("/{order_id}", response_model=Order)
 async def get_order(
+    request: Request,
     order_id: UUID,
     db: AsyncSession = Depends(get_async_db)
 ):
@@ -46,7 +65,7 @@ async def get_order(
     order = await OrderService.get_order(db, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    return order
+    return conditional_row_response(request, order, Order)
 
 
 @router.post("/", response_model=Order, status_code=201)
@@ -68,10 +87,13 @@ async def update_order(
     db: AsyncSession = Depends(get_async_db)
 ):
     """Update a specific order."""
-    order = await OrderService.update_order(db, order_id, order_update)
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
-    return order
+    try:
+        order = await OrderService.update_order(db, order_id, order_update)
+        if not order:
+            raise HTTPException(status_code=404, detail="Order not found")
+        return order
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.delete("/{order_id}", status_code=204)
@@ -95,10 +117,13 @@ async def update_order_status(
     db: AsyncSession = Depends(get_async_db)
 ):
     """Update order status."""
-    order = await OrderService.update_order_status(db, order_id, status)
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
-    return order
+    try:
+        order = await OrderService.update_order_status(db, order_id, status)
+        if not order:
+            raise HTTPException(status_code=404, detail="Order not found")
+        return order
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.put("/{order_id}/payment", response_model=Order)
@@ -134,40 +159,48 @@ async def cancel_order(
 
 @router.get("/customer/{customer_id}", response_model=OrderList)
 async def get_customer_orders(
+    request: Request,
     customer_id: UUID,
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(50, ge=1, le=100, description="Number of items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides page"),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get all orders for a specific customer."""
+    after = _decode_cursor(cursor)
     skip = (page - 1) * size
     orders, total = await OrderService.get_customer_orders(
-        db=db, customer_id=customer_id, skip=skip, limit=size
+        db=db, customer_id=customer_id, skip=skip, limit=size, after=after
     )
-    return OrderList(
+    return conditional_json_response(request, OrderList(
         orders=orders,
         total=total,
         page=page,
-        size=size
-    )
+        size=size,
+        next_cursor=next_cursor(orders, size, "created_at")
+    ).model_dump(), max_age=0)
 
 
 @router.get("/farmer/{farmer_id}", response_model=OrderList)
 async def get_farmer_orders(
+    request: Request,
     farmer_id: UUID,
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(50, ge=1, le=100, description="Number of items per page"),
     status: Optional[OrderStatus] = Query(None, description="Filter by status"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides page"),
     db: AsyncSession = Depends(get_async_db)
 ):
     """Get all orders for a specific farmer."""
+    after = _decode_cursor(cursor)
     skip = (page - 1) * size
     orders, total = await OrderService.get_farmer_orders(
-        db=db, farmer_id=farmer_id, skip=skip, limit=size, status=status
+        db=db, farmer_id=farmer_id, skip=skip, limit=size, status=status, after=after
     )
-    return OrderList(
+    return conditional_json_response(request, OrderList(
         orders=orders,
         total=total,
         page=page,
-        size=size
-    )
\ No newline at end of file
+        size=size,
+        next_cursor=next_cursor(orders, size, "created_at")
+    ).model_dump(), max_age=0)
\ No newline at end of file
@@ -1,12 +1,16 @@
 """Orders service layer for database operations."""
 
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, and_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, insert, update, delete, and_, bindparam, tuple_, values, column, Numeric
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.orm import joinedload, selectinload, raiseload, load_only
 
+from api.cache import ANALYTICS_NAMESPACE, response_cache
+from api.pagination import fetch_page
 from packages.db.models import (
     Order as OrderModel,
     OrderItem as OrderItemModel,
@@ -14,7 +18,42 @@ from packages.db.models import (
     OrderStatus,
     PaymentStatus
 )
-from .models import OrderCreate, OrderUpdate, OrderItemCreate
+from .models import OrderCreate, OrderUpdate, OrderItemCreate, OrderSummary
+
+# Order responses serialize order_items only: load them in one IN-batched
+# SELECT and make any other relationship access fail loudly instead of
+# issuing a lazy query per order.
+_ORDER_LOAD_OPTIONS = (selectinload(OrderModel.order_items), raiseload("*"))
+
+# Summary listings read only the OrderSummary columns and no items
+_ORDER_SUMMARY_OPTIONS = (
+    load_only(*(getattr(OrderModel, field) for field in OrderSummary.model_fields)),
+    raiseload("*")
+)
+
+# A single order joins its items in so one round trip returns the whole
+# order; built once, and refreshes an order already in the session.
+_GET_ORDER_STMT = (
+    select(OrderModel)
+    .where(OrderModel.id == bindparam("order_id"))
+    .options(joinedload(OrderModel.order_items), raiseload("*"))
+    .execution_options(populate_existing=True)
+)
+
+# Statuses an order can still move out of; cancelled and fulfilled are final
+_OPEN_ORDER_STATUSES = (OrderStatus.DRAFT, OrderStatus.PENDING_PAYMENT, OrderStatus.PAID)
+
+
+def _product_quantities(quantities: dict):
+    """(product_id, quantity) VALUES rows, joined against product to change stock in one UPDATE."""
+    return (
+        values(
+            column("product_id", PostgresUUID(as_uuid=True)),
+            column("quantity", Numeric(12, 2)),
+            name="quantities"
+        )
+        .data(list(quantities.items()))
+    )
 
 
 class OrderService:
@@ -28,9 +67,16 @@ class OrderService:
         customer_id: Optional[UUID] = None,
         farmer_id: Optional[UUID] = None,
         status: Optional[OrderStatus] = None,
-        payment_status: Optional[PaymentStatus] = None
+        payment_status: Optional[PaymentStatus] = None,
+        summary: bool = False,
+        after: Optional[tuple[datetime, UUID]] = None
     ) -> tuple[List[OrderModel], int]:
-        """Get orders with pagination and filtering."""
+        """Get orders with pagination and filtering.
+
+        With ``summary`` only the OrderSummary columns are loaded. When
+        ``after`` (the last seen ``(created_at, id)``) is given, the page
+        starts right after that row and ``skip`` is ignored.
+        """
         query = select(OrderModel)
         filters = []
 
@@ -46,93 +92,84 @@ class OrderService:
         if filters:
             query = query.where(and_(*filters))
 
-        # Get total count
-        count_query = select(OrderModel.id)
-        if filters:
-            count_query = count_query.where(and_(*filters))
+        if after is not None:
+            query = query.where(tuple_(OrderModel.created_at, OrderModel.id) < after)
+        else:
+            query = query.offset(skip)
 
-        total_result = await db.execute(count_query)
-        total = len(total_result.fetchall())
-
-        # Get paginated results with related data
+        # Get paginated results with related data and the total count
         query = (
-            query.options(
-                selectinload(OrderModel.customer),
-                selectinload(OrderModel.farmer),
-                selectinload(OrderModel.order_items).selectinload(OrderItemModel.product)
-            )
-            .offset(skip)
+            query.options(*(_ORDER_SUMMARY_OPTIONS if summary else _ORDER_LOAD_OPTIONS))
             .limit(limit)
-            .order_by(OrderModel.created_at.desc())
+            .order_by(OrderModel.created_at.desc(), OrderModel.id.desc())
         )
-        result = await db.execute(query)
-        orders = result.scalars().all()
-
-        return orders, total
+        return await fetch_page(db, OrderModel, query, filters)
 
     @staticmethod
     async def get_order(db: AsyncSession, order_id: UUID) -> Optional[OrderModel]:
         """Get an order by ID with all related data."""
-        query = (
-            select(OrderModel)
-            .where(OrderModel.id == order_id)
-            .options(
-                selectinload(OrderModel.customer),
-                selectinload(OrderModel.farmer),
-                selectinload(OrderModel.order_items).selectinload(OrderItemModel.product),
-                selectinload(OrderModel.shipment)
-            )
-        )
-        result = await db.execute(query)
-        return result.scalar_one_or_none()
+        result = await db.execute(_GET_ORDER_STMT, {"order_id": order_id})
+        return result.unique().scalar_one_or_none()
 
     @staticmethod
     async def create_order(db: AsyncSession, order_data: OrderCreate) -> OrderModel:
-        """Create a new order with purchase items."""
-        try:
-            # Create the order
-            order_dict = order_data.dict(exclude={'items'})
-            db_order = OrderModel(**order_dict)
-            db.add(db_order)
-            await db.flush()  # Get the order ID
+        """Create a new order with purchase items.
 
-            # Create purchase items and calculate totals
+        Stock is reserved with one guarded UPDATE over all products, and the
+        items are inserted in one statement, so concurrent orders cannot
+        oversell and the round trips do not grow with the item count.
+        """
+        try:
+            # Line and order totals come from the request, so the order row
+            # is inserted with them instead of being updated afterwards
+            item_rows = []
+            requested = {}
             subtotal = Decimal('0')
             for item in order_data.items:
-                # Get product to verify price and stock
-                product = await db.get(ProductModel, item.product_id)
-                if not product:
-                    raise ValueError(f"Product {item.product_id} not found")
-
-                if product.stock_quantity < item.quantity:
-                    raise ValueError(f"Insufficient stock for product {product.name}")
-
-                # Calculate line totals
                 line_subtotal = item.quantity * item.unit_price
                 line_total = line_subtotal - item.line_discount
-
-                # Create purchase item
-                order_item = OrderItemModel(
-                    order_id=db_order.id,
-                    product_id=item.product_id,
-                    quantity=item.quantity,
-                    unit_price=item.unit_price,
-                    line_subtotal=line_subtotal,
-                    line_discount=item.line_discount,
-                    line_total=line_total
-                )
-                db.add(order_item)
+                item_rows.append({
+                    "product_id": item.product_id,
+                    "quantity": item.quantity,
+                    "unit_price": item.unit_price,
+                    "line_subtotal": line_subtotal,
+                    "line_discount": item.line_discount,
+                    "line_total": line_total
+                })
+                requested[item.product_id] = requested.get(item.product_id, Decimal('0')) + item.quantity
                 subtotal += line_total
 
-                # Update product stock
-                product.stock_quantity -= item.quantity
+            # Take stock for every product at once; a product that is missing
+            # or short is simply not updated
+            requested_rows = _product_quantities(requested)
+            reserve_stmt = (
+                update(ProductModel)
+                .where(
+                    ProductModel.id == requested_rows.c.product_id,
+                    ProductModel.stock_quantity >= requested_rows.c.quantity
+                )
+                .values(stock_quantity=ProductModel.stock_quantity - requested_rows.c.quantity)
+                .returning(ProductModel.id)
+                .execution_options(synchronize_session=False)
+            )
+            reserved = set((await db.execute(reserve_stmt)).scalars().all())
+            if len(reserved) < len(requested):
+                await OrderService._raise_unavailable(db, order_data.items, requested, reserved)
 
-            # Update order totals
+            order_dict = order_data.dict(exclude={'items'})
+            db_order = OrderModel(**order_dict)
             db_order.subtotal_amount = subtotal
             db_order.total_amount = subtotal + db_order.shipping_amount - db_order.discount_amount
+            db.add(db_order)
+            await db.flush()  # Get the order ID
+
+            await db.execute(
+                insert(OrderItemModel),
+                [{**row, "order_id": db_order.id} for row in item_rows]
+            )
 
             await db.commit()
-            await db.refresh(db_order)
+            await response_cache.invalidate(ANALYTICS_NAMESPACE)
 
             # Load the order with all related data
             return await OrderService.get_order(db, db_order.id)
@@ -141,58 +178,107 @@ class OrderService:
             await db.rollback()
             raise e
 
+    @staticmethod
+    async def _raise_unavailable(
+        db: AsyncSession,
+        items: List[OrderItemCreate],
+        requested: dict,
+        reserved: set
+    ) -> None:
+        """Raise ValueError for the first item whose product is missing or short on stock."""
+        result = await db.execute(
+            select(ProductModel.id, ProductModel.name).where(ProductModel.id.in_(requested))
+        )
+        names = dict(result.all())
+        for item in items:
+            if item.product_id not in names:
+                raise ValueError(f"Product {item.product_id} not found")
+            if item.product_id not in reserved:
+                raise ValueError(f"Insufficient stock for product {names[item.product_id]}")
+
     @staticmethod
     async def update_order(
         db: AsyncSession,
         order_id: UUID,
         order_update: OrderUpdate
     ) -> Optional[OrderModel]:
-        """Update an order."""
-        # Get the order first
-        order = await OrderService.get_order(db, order_id)
-        if not order:
-            return None
+        """Update an order.
 
+        A status change on a cancelled or fulfilled order raises ValueError.
+        """
         # Update only provided fields
         update_data = order_update.dict(exclude_unset=True)
-        if update_data:
-            # Recalculate total if shipping or discount changed
-            if 'shipping_amount' in update_data or 'discount_amount' in update_data:
-                shipping_amount = update_data.get('shipping_amount', order.shipping_amount)
-                discount_amount = update_data.get('discount_amount', order.discount_amount)
-                update_data['total_amount'] = order.subtotal_amount + shipping_amount - discount_amount
-
-            stmt = (
-                update(OrderModel)
-                .where(OrderModel.id == order_id)
-                .values(**update_data)
-            )
-            await db.execute(stmt)
-            await db.commit()
-            await db.refresh(order)
+        if not update_data:
+            return await OrderService.get_order(db, order_id)
 
+        # Recalculate total if shipping or discount changed; SET expressions
+        # see the row's current values, so no prior read is needed
+        if 'shipping_amount' in update_data or 'discount_amount' in update_data:
+            shipping_amount = update_data.get('shipping_amount', OrderModel.shipping_amount)
+            discount_amount = update_data.get('discount_amount', OrderModel.discount_amount)
+            update_data['total_amount'] = OrderModel.subtotal_amount + shipping_amount - discount_amount
+
+        conditions = [OrderModel.id == order_id]
+        # Status changes follow the same rule as update_order_status
+        if 'status' in update_data:
+            conditions.append(OrderModel.status.in_(_OPEN_ORDER_STATUSES))
+
+        stmt = (
+            update(OrderModel)
+            .where(*conditions)
+            .values(**update_data)
+            .returning(OrderModel)
+            .options(*_ORDER_LOAD_OPTIONS)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await db.execute(stmt)
+        order = result.scalar_one_or_none()
+        if not order:
+            await db.rollback()
+            if 'status' in update_data:
+                await OrderService._raise_if_final(db, order_id)
+            return None
+
+        await db.commit()
+        await response_cache.invalidate(ANALYTICS_NAMESPACE)
         return order
 
+    @staticmethod
+    async def _raise_if_final(db: AsyncSession, order_id: UUID) -> None:
+        """After a guarded status update matched no row, raise ValueError if the order exists in a final status."""
+        current_status = await db.scalar(select(OrderModel.status).where(OrderModel.id == order_id))
+        if current_status is not None:
+            raise ValueError(f"Cannot change status of order with status {current_status.value}")
+
     @staticmethod
     async def update_order_status(
         db: AsyncSession,
         order_id: UUID,
         status: OrderStatus
     ) -> Optional[OrderModel]:
-        """Update order status."""
-        order = await OrderService.get_order(db, order_id)
-        if not order:
-            return None
+        """Update order status.
 
+        Cancelled and fulfilled orders are final; changing their status
+        raises ValueError.
+        """
         stmt = (
             update(OrderModel)
-            .where(OrderModel.id == order_id)
+            .where(OrderModel.id == order_id, OrderModel.status.in_(_OPEN_ORDER_STATUSES))
             .values(status=status)
+            .returning(OrderModel)
+            .options(*_ORDER_LOAD_OPTIONS)
+            .execution_options(synchronize_session=False, populate_existing=True)
         )
-        await db.execute(stmt)
-        await db.commit()
-        await db.refresh(order)
+        result = await db.execute(stmt)
+        order = result.scalar_one_or_none()
+        if not order:
+            await db.rollback()
+            # Only the failure path needs to tell a missing order from a final one
+            await OrderService._raise_if_final(db, order_id)
+            return None
 
+        await db.commit()
+        await response_cache.invalidate(ANALYTICS_NAMESPACE)
         return order
 
     @staticmethod
@@ -203,10 +289,6 @@ class OrderService:
         payment_reference: Optional[str] = None
     ) -> Optional[OrderModel]:
         """Update payment status."""
-        order = await OrderService.get_order(db, order_id)
-        if not order:
-            return None
-
         update_data = {"payment_status": payment_status}
         if payment_reference:
             update_data["payment_reference"] = payment_reference
@@ -215,11 +297,18 @@ class OrderService:
             update(OrderModel)
             .where(OrderModel.id == order_id)
             .values(**update_data)
+            .returning(OrderModel)
+            .options(*_ORDER_LOAD_OPTIONS)
+            .execution_options(synchronize_session=False, populate_existing=True)
         )
-        await db.execute(stmt)
-        await db.commit()
-        await db.refresh(order)
+        result = await db.execute(stmt)
+        order = result.scalar_one_or_none()
+        if not order:
+            await db.rollback()
+            return None
 
+        await db.commit()
+        await response_cache.invalidate(ANALYTICS_NAMESPACE)
         return order
 
     @staticmethod
@@ -234,17 +323,14 @@ class OrderService:
 
         try:
             # Restore stock for all purchase items
-            for order_item in order.order_items:
-                product = await db.get(ProductModel, order_item.product_id)
-                if product:
-                    product.stock_quantity += order_item.quantity
+            await OrderService._restore_stock(db, order.order_items)
 
             # Update order status
             order.status = OrderStatus.CANCELLED
 
             await db.commit()
-            await db.refresh(order)
-            return order
+            await response_cache.invalidate(ANALYTICS_NAMESPACE)
+            return await OrderService.get_order(db, order_id)
 
         except Exception as e:
             await db.rollback()
@@ -261,26 +347,42 @@ class OrderService:
             raise ValueError("Can only delete orders in DRAFT status")
 
         # Restore stock first
-        for order_item in order.order_items:
-            product = await db.get(ProductModel, order_item.product_id)
-            if product:
-                product.stock_quantity += order_item.quantity
+        await OrderService._restore_stock(db, order.order_items)
 
         stmt = delete(OrderModel).where(OrderModel.id == order_id)
         await db.execute(stmt)
         await db.commit()
+        await response_cache.invalidate(ANALYTICS_NAMESPACE)
         return True
 
+    @staticmethod
+    async def _restore_stock(db: AsyncSession, order_items: List[OrderItemModel]) -> None:
+        """Return the items' quantities to product stock in a single UPDATE."""
+        quantities = {}
+        for order_item in order_items:
+            quantities[order_item.product_id] = quantities.get(order_item.product_id, Decimal('0')) + order_item.quantity
+        if not quantities:
+            return
+
+        restored_rows = _product_quantities(quantities)
+        await db.execute(
+            update(ProductModel)
+            .where(ProductModel.id == restored_rows.c.product_id)
+            .values(stock_quantity=ProductModel.stock_quantity + restored_rows.c.quantity)
+            .execution_options(synchronize_session=False)
+        )
+
     @staticmethod
     async def get_customer_orders(
         db: AsyncSession,
         customer_id: UUID,
         skip: int = 0,
-        limit: int = 50
+        limit: int = 50,
+        after: Optional[tuple[datetime, UUID]] = None
     ) -> tuple[List[OrderModel], int]:
         """Get all orders for a specific customer."""
         return await OrderService.get_orders(
-            db=db, skip=skip, limit=limit, customer_id=customer_id
+            db=db, skip=skip, limit=limit, customer_id=customer_id, after=after
         )
 
     @staticmethod
@@ -289,9 +391,10 @@ class OrderService:
         farmer_id: UUID,
         skip: int = 0,
         limit: int = 50,
-        status: Optional[OrderStatus] = None
+        status: Optional[OrderStatus] = None,
+        after: Optional[tuple[datetime, UUID]] = None
     ) -> tuple[List[OrderModel], int]:
         """Get all orders for a specific farmer."""
         return await OrderService.get_orders(
-            db=db, skip=skip, limit=limit, farmer_id=farmer_id, status=status
+            db=db, skip=skip, limit=limit, farmer_id=farmer_id, status=status, after=after
         )
\ No newline at end of file
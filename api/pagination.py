@@ -0,0 +1,121 @@
+"""Query helpers shared by paginated list endpoints."""
+
+import asyncio
+import base64
+import json
+from datetime import datetime
+from typing import Any, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select, func, and_, literal_column
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import ClauseElement, Executable, Select
+from sqlalchemy.sql.visitors import InternalTraversal
+
+
+class _Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` around a statement, keeping its bound parameters."""
+
+    inherit_cache = True
+    _traverse_internals = [("statement", InternalTraversal.dp_clauseelement)]
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain)
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _count_stmt(model: Any, filters: List[Any]) -> Select:
+    stmt = select(func.count()).select_from(model)
+    if filters:
+        stmt = stmt.where(and_(*filters))
+    return stmt
+
+
+async def _estimate_count(conn: AsyncConnection, model: Any, filters: List[Any], params: Optional[dict]) -> int:
+    """Planner's row estimate for the filtered rows, from EXPLAIN without running the query."""
+    stmt = select(literal_column("1")).select_from(model)
+    if filters:
+        stmt = stmt.where(and_(*filters))
+    result = await conn.execute(_Explain(stmt), params)
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def fetch_page(
+    db: AsyncSession,
+    model: Any,
+    query: Select,
+    filters: Iterable[Any] = (),
+    params: Optional[dict] = None,
+    exact_count: bool = True,
+    skip: int = 0,
+    limit: Optional[int] = None
+) -> tuple[List[Any], int]:
+    """Run a page query and its COUNT(*) concurrently.
+
+    The page is loaded through the request session so its objects stay
+    attached; the count runs on a separate pooled connection, as a single
+    session executes one statement at a time. ``params`` supplies values for
+    named bindparams used by either statement.
+
+    With ``exact_count=False`` the total is the planner's estimate instead,
+    corrected by what the page itself shows (``skip`` and ``limit`` describe
+    the page's offset and size).
+    """
+    filters = list(filters)
+    count_stmt = _count_stmt(model, filters)
+
+    async def count() -> int:
+        async with db.bind.connect() as conn:
+            if not exact_count:
+                return await _estimate_count(conn, model, filters, params)
+            return (await conn.execute(count_stmt, params)).scalar_one()
+
+    total, result = await asyncio.gather(count(), db.execute(query, params))
+    rows = result.scalars().all()
+
+    if not exact_count:
+        seen = skip + len(rows)
+        # A short page is the last one, so the total is known exactly
+        if limit is not None and len(rows) < limit:
+            total = seen
+        else:
+            total = max(total, seen)
+
+    return rows, total
+
+
+def contains_pattern(term: str) -> str:
+    """ILIKE pattern matching ``term`` anywhere, with its own wildcards escaped."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def encode_cursor(sort_value: datetime, row_id: UUID) -> str:
+    """Build an opaque keyset cursor from the last row's sort value and id."""
+    raw = f"{sort_value.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Parse a cursor made by encode_cursor. Raises ValueError if it is malformed."""
+    try:
+        sort_value, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(sort_value), UUID(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def next_cursor(rows: List[Any], limit: int, sort_attr: str) -> Optional[str]:
+    """Cursor for the page after ``rows``, or None when this is the last page."""
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(getattr(last, sort_attr), last.id)
@@ -9,7 +9,7 @@ class BasePaymentProvider(ABC):
     """Abstract base class for payment providers."""
 
     @abstractmethod
-    def create_payment(
+    async def create_payment(
         self,
         amount: Decimal,
         currency: str,
@@ -22,17 +22,17 @@ class BasePaymentProvider(ABC):
         pass
 
     @abstractmethod
-    def execute_payment(self, payment_id: str, payer_id: str) -> Dict[str, Any]:
+    async def execute_payment(self, payment_id: str, payer_id: str) -> Dict[str, Any]:
         """Execute a payment after approval."""
         pass
 
     @abstractmethod
-    def get_payment_details(self, payment_id: str) -> Dict[str, Any]:
+    async def get_payment_details(self, payment_id: str) -> Dict[str, Any]:
         """Get payment details."""
         pass
 
     @abstractmethod
-    def refund_payment(
+    async def refund_payment(
         self,
         transaction_id: str,
         amount: Optional[Decimal] = None
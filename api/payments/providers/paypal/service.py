@@ -1,44 +1,111 @@
 """PayPal payment provider implementation."""
 
+import asyncio
 import os
 import logging
+import time
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from decimal import Decimal
-import paypalrestsdk
-from paypalrestsdk import Payment as PayPalPayment
-from paypalrestsdk import configure
+
+import httpx
 
 from ..base import BasePaymentProvider
 
 logger = logging.getLogger(__name__)
 
+_PAYPAL_API_URLS = {
+    "sandbox": "https://api-m.sandbox.paypal.com",
+    "live": "https://api-m.paypal.com",
+}
+
+# Refresh the OAuth token this long before PayPal says it expires
+_TOKEN_EXPIRY_MARGIN_SECONDS = 60
+
 
 class PayPalProvider(BasePaymentProvider):
-    """PayPal payment provider implementation."""
+    """PayPal payment provider implementation.
+
+    Talks to the PayPal REST API over one pooled ``httpx.AsyncClient``, so
+    payment calls never block the event loop and reuse open connections.
+    The OAuth access token is cached until shortly before it expires.
+    """
 
     def __init__(self):
-        """Initialize PayPal SDK configuration."""
+        """Initialize PayPal configuration."""
+        self._client: Optional[httpx.AsyncClient] = None
+        self._access_token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
         self._configure_paypal()
 
     def _configure_paypal(self):
-        """Configure PayPal SDK with environment variables."""
+        """Configure PayPal with environment variables."""
         mode = os.getenv("PAYPAL_MODE", "sandbox")
-        client_id = os.getenv("PAYPAL_CLIENT_ID")
-        client_secret = os.getenv("PAYPAL_CLIENT_SECRET")
+        self._base_url = _PAYPAL_API_URLS.get(mode, _PAYPAL_API_URLS["sandbox"])
+        self._client_id = os.getenv("PAYPAL_CLIENT_ID")
+        self._client_secret = os.getenv("PAYPAL_CLIENT_SECRET")
 
-        if not client_id or not client_secret:
+        if not self._client_id or not self._client_secret:
             logger.warning("PayPal credentials not found in environment variables")
             return
 
-        configure({
-            "mode": mode,
-            "client_id": client_id,
-            "client_secret": client_secret
-        })
-
-        logger.info(f"PayPal SDK configured in {mode} mode")
+        logger.info(f"PayPal configured in {mode} mode")
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+            )
+        return self._client
+
+    async def _get_access_token(self) -> str:
+        """Return a cached OAuth access token, fetching a new one when it is about to expire."""
+        if self._access_token and time.monotonic() < self._token_expires_at:
+            return self._access_token
+
+        async with self._token_lock:
+            # Another request may have refreshed it while we waited
+            if self._access_token and time.monotonic() < self._token_expires_at:
+                return self._access_token
+
+            response = await self._get_client().post(
+                "/v1/oauth2/token",
+                auth=(self._client_id or "", self._client_secret or ""),
+                data={"grant_type": "client_credentials"}
+            )
+            response.raise_for_status()
+            token = response.json()
+            self._access_token = token["access_token"]
+            self._token_expires_at = (
+                time.monotonic() + token.get("expires_in", 0) - _TOKEN_EXPIRY_MARGIN_SECONDS
+            )
+            return self._access_token
+
+    async def _request(self, method: str, path: str, json: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        """Send an authenticated API request, retrying once if the token was revoked."""
+        for attempt in range(2):
+            token = await self._get_access_token()
+            response = await self._get_client().request(
+                method, path, json=json, headers={"Authorization": f"Bearer {token}"}
+            )
+            if response.status_code != 401 or attempt:
+                return response
+            self._access_token = None
+        return response
+
+    @staticmethod
+    def _error(response: httpx.Response) -> Any:
+        """PayPal's error body, or the status line if it is not JSON."""
+        try:
+            return response.json()
+        except ValueError:
+            return f"HTTP {response.status_code}"
 
-    def create_payment(
+    async def create_payment(
         self,
         amount: Decimal,
         currency: str = "ILS",
@@ -81,34 +148,39 @@ class PayPalProvider(BasePaymentProvider):
                 }]
             }
 
-            payment = PayPalPayment(payment_data)
+            response = await self._request("POST", "/v1/payments/payment", json=payment_data)
 
-            if payment.create():
+            if response.is_success:
+                payment = response.json()
                 approval_url = None
-                for link in payment.links:
-                    if link.rel == "approval_url":
-                        approval_url = link.href
+                for link in payment.get("links", []):
+                    if link.get("rel") == "approval_url":
+                        approval_url = link.get("href")
                         break
 
                 return {
                     "success": True,
-                    "payment_id": payment.id,
+                    "payment_id": payment.get("id"),
                     "approval_url": approval_url
                 }
             else:
-                return {"success": False, "error": payment.error}
+                return {"success": False, "error": self._error(response)}
 
         except Exception as e:
             logger.error(f"PayPal payment creation error: {str(e)}")
             return {"success": False, "error": str(e)}
 
-    def execute_payment(self, payment_id: str, payer_id: str) -> Dict[str, Any]:
+    async def execute_payment(self, payment_id: str, payer_id: str) -> Dict[str, Any]:
         """Execute a PayPal payment after approval."""
         try:
-            payment = PayPalPayment.find(payment_id)
-
-            if payment.execute({"payer_id": payer_id}):
-                transaction = payment.transactions[0] if payment.transactions else {}
+            response = await self._request(
+                "POST", f"/v1/payments/payment/{payment_id}/execute", json={"payer_id": payer_id}
+            )
+
+            if response.is_success:
+                payment = response.json()
+                transactions = payment.get("transactions") or []
+                transaction = transactions[0] if transactions else {}
                 related_resources = transaction.get('related_resources', [])
                 sale_info = None
                 if related_resources:
@@ -116,38 +188,35 @@ class PayPalProvider(BasePaymentProvider):
 
                 return {
                     "success": True,
-                    "payment_id": payment.id,
-                    "payment_state": payment.state,
+                    "payment_id": payment.get("id"),
+                    "payment_state": payment.get("state"),
                     "transaction_id": sale_info.get('id') if sale_info else None,
                     "amount": sale_info.get('amount', {}).get('total') if sale_info else None,
                     "currency": sale_info.get('amount', {}).get('currency') if sale_info else None,
                     "order_id": transaction.get('custom')
                 }
             else:
-                return {"success": False, "error": payment.error}
+                return {"success": False, "error": self._error(response)}
 
         except Exception as e:
             logger.error(f"PayPal payment execution error: {str(e)}")
             return {"success": False, "error": str(e)}
 
-    def get_payment_details(self, payment_id: str) -> Dict[str, Any]:
+    async def get_payment_details(self, payment_id: str) -> Dict[str, Any]:
         """Get PayPal payment details."""
         try:
-            payment = PayPalPayment.find(payment_id)
-            if payment:
-                return {"success": True, "payment": payment.to_dict()}
+            response = await self._request("GET", f"/v1/payments/payment/{payment_id}")
+            if response.is_success:
+                return {"success": True, "payment": response.json()}
             else:
                 return {"success": False, "error": "Payment not found"}
         except Exception as e:
             logger.error(f"PayPal get payment details error: {str(e)}")
             return {"success": False, "error": str(e)}
 
-    def refund_payment(self, transaction_id: str, amount: Optional[Decimal] = None) -> Dict[str, Any]:
+    async def refund_payment(self, transaction_id: str, amount: Optional[Decimal] = None) -> Dict[str, Any]:
         """Refund a PayPal payment."""
         try:
-            from paypalrestsdk import Sale
-
-            sale = Sale.find(transaction_id)
             refund_data = {}
             if amount:
                 refund_data["amount"] = {
@@ -155,16 +224,19 @@ class PayPalProvider(BasePaymentProvider):
                     "currency": "ILS"
                 }
 
-            refund = sale.refund(refund_data)
+            response = await self._request(
+                "POST", f"/v1/payments/sale/{transaction_id}/refund", json=refund_data
+            )
 
-            if refund.success():
+            if response.is_success:
+                refund = response.json()
                 return {
                     "success": True,
-                    "refund_id": refund.id,
-                    "refund_state": refund.state
+                    "refund_id": refund.get("id"),
+                    "refund_state": refund.get("state")
                 }
             else:
-                return {"success": False, "error": refund.error}
+                return {"success": False, "error": self._error(response)}
 
         except Exception as e:
             logger.error(f"PayPal refund error: {str(e)}")
@@ -177,5 +249,7 @@ class PayPalProvider(BasePaymentProvider):
         return "PAYPAL"
 
 
-# Global instance
-paypal_provider = PayPalProvider()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_paypal_provider() -> PayPalProvider:
+    """Return the shared provider, configuring it on the first payment call rather than at import."""
+    return PayPalProvider()
@@ -63,7 +63,7 @@ async def execute_paypal_payment(
 @router.get("/paypal/{payment_id}/details")
 async def get_payment_details(payment_id: str) -> Dict[str, Any]:
     """Get PayPal payment details."""
-    result = PaymentService.get_payment_details(payment_id)
+    result = await PaymentService.get_payment_details(payment_id)
 
     if not result["success"]:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=result["error"])
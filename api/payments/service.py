@@ -7,8 +7,9 @@ from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 
+from api.cache import ANALYTICS_NAMESPACE, response_cache
 from packages.db.models import Order as OrderModel, PaymentStatus, OrderStatus
-from .providers.paypal.service import paypal_provider
+from .providers.paypal.service import get_paypal_provider
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +42,7 @@ class PaymentService:
 
             # Create PayPal payment
             description = f"Farm Order #{str(order.id)[:8]} - From Field to You"
-            payment_result = paypal_provider.create_payment(
+            payment_result = await get_paypal_provider().create_payment(
                 amount=order.total_amount,
                 currency=order.currency,
                 description=description,
@@ -63,6 +64,7 @@ class PaymentService:
 
             await db.execute(update_stmt)
             await db.commit()
+            await response_cache.invalidate(ANALYTICS_NAMESPACE)
 
             return {
                 "success": True,
@@ -86,7 +88,7 @@ class PaymentService:
     ) -> Dict[str, Any]:
         """Execute PayPal payment after approval."""
         try:
-            execution_result = paypal_provider.execute_payment(payment_id, payer_id)
+            execution_result = await get_paypal_provider().execute_payment(payment_id, payer_id)
 
             if not execution_result["success"]:
                 return {"success": False, "error": f"PayPal payment execution failed: {execution_result.get('error')}"}
@@ -103,6 +105,7 @@ class PaymentService:
                     )
                     await db.execute(update_stmt)
                     await db.commit()
+                    await response_cache.invalidate(ANALYTICS_NAMESPACE)
                 except ValueError:
                     logger.warning(f"Invalid order ID from PayPal: {order_id}")
 
@@ -122,10 +125,10 @@ class PaymentService:
             return {"success": False, "error": "Internal server error"}
 
     @staticmethod
-    def get_payment_details(payment_id: str) -> Dict[str, Any]:
+    async def get_payment_details(payment_id: str) -> Dict[str, Any]:
         """Get PayPal payment details."""
         try:
-            result = paypal_provider.get_payment_details(payment_id)
+            result = await get_paypal_provider().get_payment_details(payment_id)
             if result["success"]:
                 return {"success": True, "payment": result["payment"]}
             else:
@@ -160,7 +163,7 @@ class PaymentService:
                 return {"success": False, "error": "No PayPal transaction reference found"}
 
             # Process refund
-            refund_result = paypal_provider.refund_payment(order.payment_reference, amount)
+            refund_result = await get_paypal_provider().refund_payment(order.payment_reference, amount)
 
             if not refund_result["success"]:
                 return {"success": False, "error": f"PayPal refund failed: {refund_result.get('error')}"}
@@ -176,6 +179,7 @@ class PaymentService:
 
             await db.execute(update_stmt)
             await db.commit()
+            await response_cache.invalidate(ANALYTICS_NAMESPACE)
 
             return {
                 "success": True,
@@ -6,6 +6,7 @@ from fastapi import APIRouter, HTTPException, Query, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
+from api.responses import ORJSONResponse
 from packages.db.session import get_async_db
 from .models import Product, ProductCreate, ProductUpdate, ProductList, ProductSummary
 from .service import ProductService
@@ -31,12 +32,12 @@ async def get_products(
         category=category, is_active=is_active, is_organic=is_organic,
         available_only=available_only
     )
-    return ProductList(
+    return ORJSONResponse(content=ProductList(
         products=[Product.from_orm_product(p) for p in products],
         total=total,
         page=page,
         size=size
-    )
+    ).model_dump())
 
 
 @router.get("/{product_id}", response_model=Product)
@@ -98,12 +99,12 @@ async def search_products(
     products, total = await ProductService.search_products(
         db=db, search_term=q, skip=skip, limit=size, is_active=is_active
     )
-    return ProductList(
+    return ORJSONResponse(content=ProductList(
         products=[Product.from_orm_product(p) for p in products],
         total=total,
         page=page,
         size=size
-    )
+    ).model_dump())
 
 
 @router.get("/category/{category}", response_model=list[Product])
@@ -114,7 +115,7 @@ async def get_products_by_category(
 ):
     """Get all products in a specific category."""
     products = await ProductService.get_products_by_category(db, category, is_active)
-    return [Product.from_orm_product(p) for p in products]
+    return ORJSONResponse(content=[Product.from_orm_product(p).model_dump() for p in products])
 
 
 @router.get("/farmer/{farmer_id}", response_model=list[Product])
@@ -125,7 +126,7 @@ async def get_products_by_farmer(
 ):
     """Get all products for a specific farmer."""
     products = await ProductService.get_products_by_farmer(db, farmer_id, is_active)
-    return [Product.from_orm_product(p) for p in products]
+    return ORJSONResponse(content=[Product.from_orm_product(p).model_dump() for p in products])
 
 
 @router.put("/{product_id}/stock", response_model=Product)
@@ -151,4 +152,4 @@ async def get_low_stock_products(
 ):
     """Get products with stock below threshold."""
     products = await ProductService.get_low_stock_products(db, threshold)
-    return [Product.from_orm_product(p) for p in products]
\ No newline at end of file
+    return ORJSONResponse(content=[Product.from_orm_product(p).model_dump() for p in products])
\ No newline at end of file
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete, and_
 from sqlalchemy.orm import selectinload
 
+from api.cache import ANALYTICS_NAMESPACE, response_cache
 from packages.db.models import Product as ProductModel, Category, UnitLabel
 from .models import ProductCreate, ProductUpdate
 
@@ -140,6 +141,7 @@ class ProductService:
         db_product = ProductModel(**product_dict)
         db.add(db_product)
         await db.commit()
+        await response_cache.invalidate(ANALYTICS_NAMESPACE)
         await db.refresh(db_product)
         
         # Re-fetch with eager loading to avoid lazy load issues in async context
@@ -194,6 +196,7 @@ class ProductService:
             )
             await db.execute(stmt)
             await db.commit()
+            await response_cache.invalidate(ANALYTICS_NAMESPACE)
 
         # Re-fetch with eager loading to avoid lazy load issues in async context
         return await ProductService.get_product(db, product_id)
@@ -208,6 +211,7 @@ class ProductService:
         stmt = delete(ProductModel).where(ProductModel.id == product_id)
         await db.execute(stmt)
         await db.commit()
+        await response_cache.invalidate(ANALYTICS_NAMESPACE)
         return True
 
     @staticmethod
@@ -232,6 +236,7 @@ class ProductService:
         )
         await db.execute(stmt)
         await db.commit()
+        await response_cache.invalidate(ANALYTICS_NAMESPACE)
         await db.refresh(product)
 
         return product
@@ -0,0 +1,87 @@
+"""Per-client request rate limiting for expensive endpoints.
+
+Counts are kept in the shared response cache backend (Redis when REDIS_URL is
+configured), so limits hold across workers. If the backend is unavailable the
+limiter lets requests through.
+
+Limits apply per route and client IP. Requests relayed by a proxy or the
+Streamlit server are attributed to the address in ``X-Forwarded-For`` when the
+relaying peer is listed in TRUSTED_PROXY_IPS; otherwise they share the peer's
+counter. An optional per-account counter on the submitted email applies on top
+of the per-IP one, so guessing one account's password from many addresses is
+throttled too.
+"""
+
+import json
+import os
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+
+from api.cache import response_cache
+
+AUTH_RATE_LIMIT = int(os.getenv("AUTH_RATE_LIMIT", "5"))
+AUTH_RATE_LIMIT_WINDOW_SECONDS = int(os.getenv("AUTH_RATE_LIMIT_WINDOW_SECONDS", "60"))
+AUTH_ACCOUNT_RATE_LIMIT = int(os.getenv("AUTH_ACCOUNT_RATE_LIMIT", "10"))
+TRUSTED_PROXY_IPS = frozenset(
+    ip.strip() for ip in os.getenv("TRUSTED_PROXY_IPS", "").split(",") if ip.strip()
+)
+
+
+def client_ip(request: Request) -> str:
+    """The caller's address, taken from X-Forwarded-For only when the peer is a trusted proxy."""
+    peer = request.client.host if request.client else "unknown"
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded and peer in TRUSTED_PROXY_IPS:
+        return forwarded.split(",")[0].strip()
+    return peer
+
+
+async def _submitted_email(request: Request) -> str:
+    """The ``email`` field of a JSON body, lower-cased, or an empty string."""
+    try:
+        body = json.loads(await request.body() or b"{}")
+    except ValueError:
+        return ""
+    email = body.get("email") if isinstance(body, dict) else None
+    return email.strip().lower() if isinstance(email, str) else ""
+
+
+class RateLimiter:
+    """FastAPI dependency allowing ``limit`` requests per route and client IP per window.
+
+    With ``account_limit`` set, requests naming the same email in their body
+    are also limited to ``account_limit`` per route and window across all
+    addresses. A window starts with a key's first request and lasts
+    ``window_seconds``.
+    """
+
+    def __init__(self, namespace: str, limit: int, window_seconds: int, account_limit: Optional[int] = None):
+        self.namespace = namespace
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.account_limit = account_limit
+
+    async def _exceeded(self, key: str, limit: int) -> bool:
+        return await response_cache.increment(key, self.window_seconds) > limit
+
+    async def __call__(self, request: Request) -> None:
+        prefix = f"ratelimit:{self.namespace}:{request.url.path}"
+        limited = await self._exceeded(f"{prefix}:ip:{client_ip(request)}", self.limit)
+
+        if self.account_limit is not None and not limited:
+            email = await _submitted_email(request)
+            if email:
+                limited = await self._exceeded(f"{prefix}:account:{email}", self.account_limit)
+
+        if limited:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": str(self.window_seconds)}
+            )
+
+
+auth_rate_limit = RateLimiter(
+    "auth", AUTH_RATE_LIMIT, AUTH_RATE_LIMIT_WINDOW_SECONDS, account_limit=AUTH_ACCOUNT_RATE_LIMIT
+)
@@ -0,0 +1,165 @@
+"""Shared response classes for From Field to You API."""
+
+import hashlib
+from datetime import date, datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator
+from uuid import UUID
+
+import orjson
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+# Serializers for types orjson does not handle natively, keyed by exact type
+_ORJSON_DISPATCH = {
+    Decimal: str,
+    UUID: str,
+    date: date.isoformat,
+}
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+# Browser-side freshness window for conditional JSON responses
+CLIENT_CACHE_MAX_AGE = 30
+
+# Cache-Control for public, read-mostly resources that shared caches (CDN,
+# reverse proxy) may store and briefly serve stale while revalidating
+PUBLIC_CACHE_CONTROL = f"public, max-age={CLIENT_CACHE_MAX_AGE}, stale-while-revalidate=300"
+
+
+def _default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively."""
+    serializer = _ORJSON_DISPATCH.get(type(obj))
+    if serializer is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return serializer(obj)
+
+
+def dump_json(content: Any) -> bytes:
+    """Serialize content to JSON bytes with orjson."""
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Routes return this directly with already-built content, which skips
+    FastAPI's jsonable_encoder and response_model revalidation. Content can
+    be a plain ``model_dump()``: datetimes and UUIDs are serialized natively
+    by orjson and Decimals go through a single dispatch lookup.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header lists the given ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    return bool(if_none_match) and etag in (tag.strip() for tag in if_none_match.split(","))
+
+
+def conditional_json_response(
+    request: Request,
+    content: Any,
+    max_age: int = CLIENT_CACHE_MAX_AGE
+) -> Response:
+    """Return JSON with an ETag, or an empty 304 if the client already has it.
+
+    Content that is already serialized (``bytes``) is sent as is.
+    """
+    body = content if isinstance(content, bytes) else dump_json(content)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={max_age}"}
+
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _not_modified_since(request: Request, last_modified: datetime) -> bool:
+    """Check the request's If-Modified-Since header (one-second resolution) against a timestamp."""
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def _row_validators(
+    request: Request,
+    row_id: Any,
+    updated_at: datetime,
+    cache_control: str
+) -> tuple[dict, bool]:
+    """Build ETag/Last-Modified headers for a row and check them against the request."""
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    etag = f'"{row_id}-{updated_at.timestamp()}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(updated_at.astimezone(timezone.utc), usegmt=True),
+        "Cache-Control": cache_control
+    }
+
+    # If-None-Match takes precedence; If-Modified-Since only applies without it
+    if "if-none-match" in request.headers:
+        not_modified = etag_matches(request, etag)
+    else:
+        not_modified = _not_modified_since(request, updated_at)
+    return headers, not_modified
+
+
+def conditional_row_response(
+    request: Request,
+    row: Any,
+    schema: type[BaseModel],
+    cache_control: str = "private, no-cache"
+) -> Response:
+    """Serialize an ORM row through ``schema``, or return an empty 304 if the client has it.
+
+    Validators come from the row's ``id`` and ``updated_at``, so an unchanged
+    row is answered without building the response body. By default clients
+    must revalidate on every use.
+    """
+    headers, not_modified = _row_validators(request, row.id, row.updated_at, cache_control)
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return ORJSONResponse(content=schema.model_validate(row).model_dump(), headers=headers)
+
+
+def conditional_body_response(
+    request: Request,
+    row_id: Any,
+    updated_at: datetime,
+    body: bytes,
+    cache_control: str = "private, no-cache"
+) -> Response:
+    """Like conditional_row_response, for a row whose JSON body is already serialized."""
+    headers, not_modified = _row_validators(request, row_id, updated_at, cache_control)
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def stream_json_list(field: str, items: AsyncIterator[BaseModel]) -> AsyncIterator[bytes]:
+    """Yield a ``{"<field>": [...], "total": n}`` JSON document one item at a time."""
+    yield b'{"' + field.encode() + b'":['
+    total = 0
+    async for item in items:
+        if total:
+            yield b","
+        yield dump_json(item.model_dump())
+        total += 1
+    yield b'],"total":' + str(total).encode() + b"}"
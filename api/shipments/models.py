@@ -6,9 +6,6 @@ from uuid import UUID
 from pydantic import BaseModel, Field
 
 # Import centralized enums
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 from packages.db.enums import ShipmentStatus
 
 
@@ -5,6 +5,7 @@ from fastapi import APIRouter, HTTPException, Query, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
+from api.responses import ORJSONResponse
 from packages.db.session import get_async_db
 from packages.db.models import ShipmentStatus
 from .models import Shipment, ShipmentCreate, ShipmentUpdate, ShipmentList, TrackingInfo
@@ -26,12 +27,12 @@ async def get_shipments(
     shipments, total = await ShipmentService.get_shipments(
         db=db, skip=skip, limit=size, status=status, carrier_name=carrier_name
     )
-    return ShipmentList(
+    return ORJSONResponse(content=ShipmentList(
         shipments=shipments,
         total=total,
         page=page,
         size=size
-    )
+    ).model_dump())
 
 
 @router.get("/{shipment_id}", response_model=Shipment)
@@ -184,12 +185,12 @@ async def search_shipments(
     shipments, total = await ShipmentService.search_shipments(
         db=db, search_term=q, skip=skip, limit=size
     )
-    return ShipmentList(
+    return ORJSONResponse(content=ShipmentList(
         shipments=shipments,
         total=total,
         page=page,
         size=size
-    )
+    ).model_dump())
 
 
 @router.get("/status/{status}", response_model=ShipmentList)
@@ -204,9 +205,9 @@ async def get_shipments_by_status(
     shipments, total = await ShipmentService.get_shipments_by_status(
         db=db, status=status, skip=skip, limit=size
     )
-    return ShipmentList(
+    return ORJSONResponse(content=ShipmentList(
         shipments=shipments,
         total=total,
         page=page,
         size=size
-    )
\ No newline at end of file
+    ).model_dump())
\ No newline at end of file
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete, and_
 from sqlalchemy.orm import selectinload
 
+from api.cache import ANALYTICS_NAMESPACE, response_cache
 from packages.db.models import (
     Shipment as ShipmentModel,
     Order as OrderModel,
@@ -118,6 +119,7 @@ class ShipmentService:
         db_shipment = ShipmentModel(**shipment_data.model_dump())
         db.add(db_shipment)
         await db.commit()
+        await response_cache.invalidate(ANALYTICS_NAMESPACE)
         await db.refresh(db_shipment)
 
         # Load with order details
@@ -145,6 +147,7 @@ class ShipmentService:
             )
             await db.execute(stmt)
             await db.commit()
+            await response_cache.invalidate(ANALYTICS_NAMESPACE)
             await db.refresh(shipment)
 
         return shipment
@@ -178,6 +181,7 @@ class ShipmentService:
         )
         await db.execute(stmt)
         await db.commit()
+        await response_cache.invalidate(ANALYTICS_NAMESPACE)
         await db.refresh(shipment)
 
         return shipment
@@ -254,6 +258,7 @@ class ShipmentService:
         stmt = delete(ShipmentModel).where(ShipmentModel.id == shipment_id)
         await db.execute(stmt)
         await db.commit()
+        await response_cache.invalidate(ANALYTICS_NAMESPACE)
         return True
 
     @staticmethod
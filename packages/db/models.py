@@ -3,7 +3,7 @@
 from datetime import datetime
 from sqlalchemy import (
     Column, String, Text, Boolean, DateTime, Numeric, Date,
-    ForeignKey, CheckConstraint, Index, UUID, Enum
+    ForeignKey, CheckConstraint, Index, UUID, Enum, TypeDecorator, literal_column
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -20,6 +20,15 @@ from .enums import (
 Base = declarative_base()
 
 
+class LowerEmail(TypeDecorator):
+    """Text email column that is trimmed and lowercased whenever a value is bound."""
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return value.strip().lower() if value else value
+
+
 class Category(Base):
     """Product category table model."""
     __tablename__ = "category"
@@ -67,7 +76,7 @@ class Farmer(Base):
     id = Column(PostgresUUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     name = Column(Text, nullable=False)
     farm_name = Column(Text, nullable=False)
-    email = Column(Text, nullable=False, unique=True)
+    email = Column(LowerEmail, nullable=False, unique=True)
     password_hash = Column(Text, nullable=False)
     phone = Column(Text)
     address_line1 = Column(Text)
@@ -97,6 +106,17 @@ class Farmer(Base):
     products = relationship("Product", back_populates="farmer")
     orders = relationship("Order", back_populates="farmer")
 
+    __table_args__ = (
+        Index('idx_farmer_email_lower', func.lower(email), unique=True),
+        # Trigram index for the single ILIKE farmer search over name, farm and email (needs pg_trgm)
+        Index(
+            'idx_farmer_search_trgm',
+            (name + literal_column("' '") + farm_name + literal_column("' '") + email).label('search_text'),
+            postgresql_using='gin',
+            postgresql_ops={'search_text': 'gin_trgm_ops'}
+        ),
+    )
+
 
 class Customer(Base):
     """Customer table model."""
@@ -105,7 +125,7 @@ class Customer(Base):
     id = Column(PostgresUUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     first_name = Column(Text, nullable=False)
     last_name = Column(Text, nullable=False)
-    email = Column(Text, nullable=False, unique=True)
+    email = Column(LowerEmail, nullable=False, unique=True)
     password_hash = Column(Text, nullable=False)
     phone = Column(Text)
     address_line1 = Column(Text)
@@ -120,6 +140,19 @@ class Customer(Base):
     # Relationships
     orders = relationship("Order", back_populates="customer")
 
+    __table_args__ = (
+        Index('idx_customer_email_lower', func.lower(email), unique=True),
+        # Trigram index for substring search over name and email (needs pg_trgm)
+        Index(
+            'idx_customer_search_trgm',
+            (first_name + literal_column("' '") + last_name + literal_column("' '") + email).label('search_text'),
+            postgresql_using='gin',
+            postgresql_ops={'search_text': 'gin_trgm_ops'}
+        ),
+        Index('idx_customer_created_at', created_at.desc(), id.desc()),
+        Index('idx_customer_marketing_created_at', 'marketing_opt_in', created_at.desc(), id.desc()),
+    )
+
 
 class Product(Base):
     """Product table model with foreign keys to category and unit_label."""
@@ -157,6 +190,8 @@ class Product(Base):
         Index('idx_product_category_id', 'category_id'),
         Index('idx_product_unit_label_id', 'unit_label_id'),
         Index('idx_product_is_active', 'is_active'),
+        Index('idx_product_farmer_active', 'farmer_id', 'is_active', postgresql_where=(is_active == True)),
+        Index('idx_product_farmer_low_stock', 'farmer_id', postgresql_where=(stock_quantity <= 10)),
     )
 
 
@@ -202,10 +237,15 @@ class Order(Base):
 
     # Indexes
     __table_args__ = (
-        Index('idx_orders_customer_id', 'customer_id'),
-        Index('idx_orders_farmer_id', 'farmer_id'),
-        Index('idx_orders_status', 'status'),
-        Index('idx_orders_created_at', 'created_at'),
+        # Filter columns first, then the (created_at, id) sort key, so get_orders
+        # reads its page (or seeks to its cursor) in index order
+        Index('idx_orders_created_at_id', created_at.desc(), id.desc()),
+        Index('idx_orders_status_created_at', 'status', created_at.desc(), id.desc()),
+        Index('idx_orders_payment_status_created_at', 'payment_status', created_at.desc(), id.desc()),
+        Index('idx_orders_farmer_created_at', 'farmer_id', created_at.desc(), id.desc()),
+        Index('idx_orders_farmer_status_created_at', 'farmer_id', 'status', created_at.desc(), id.desc()),
+        Index('idx_orders_customer_created_at', 'customer_id', created_at.desc(), id.desc()),
+        Index('idx_orders_customer_status_created_at', 'customer_id', 'status', created_at.desc(), id.desc()),
     )
 
 
@@ -268,6 +308,7 @@ class Shipment(Base):
     __table_args__ = (
         Index('idx_shipment_order_id', 'order_id'),
         Index('idx_shipment_status', 'status'),
+        Index('idx_shipment_status_order_id', 'status', 'order_id'),
     )
 
 
@@ -311,9 +352,10 @@ class Cart(Base):
 
     # Indexes
     __table_args__ = (
-        Index('idx_cart_session_id', 'session_id'),
-        Index('idx_cart_customer_id', 'customer_id'),
-        Index('idx_cart_status', 'status'),
+        Index('idx_cart_session_updated_at', 'session_id', updated_at.desc(), id.desc()),
+        Index('idx_cart_customer_updated_at', 'customer_id', updated_at.desc(), id.desc()),
+        Index('idx_cart_status_updated_at', 'status', updated_at.desc(), id.desc()),
+        Index('idx_cart_updated_at', updated_at.desc(), id.desc()),
     )
 
 
@@ -336,8 +378,8 @@ class CartItem(Base):
     # Constraints
     __table_args__ = (
         CheckConstraint('quantity > 0', name='check_cart_quantity_positive'),
-        Index('idx_cart_item_cart_id', 'cart_id'),
         Index('idx_cart_item_product_id', 'product_id'),
+        Index('idx_cart_item_cart_product', 'cart_id', 'product_id', unique=True),
     )
 
 
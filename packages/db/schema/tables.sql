@@ -1,5 +1,7 @@
 -- Enable UUID generation
 CREATE EXTENSION IF NOT EXISTS pgcrypto;
+-- Enable trigram indexes for substring search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 --------------------------------------------------
 -- ENUM TYPES
@@ -102,6 +104,10 @@ CREATE TABLE farmer (
     updated_at          timestamptz NOT NULL DEFAULT now()
 );
 
+CREATE UNIQUE INDEX idx_farmer_email_lower ON farmer(lower(email));
+-- Trigram index for the single ILIKE farmer search over name, farm_name and email
+CREATE INDEX idx_farmer_search_trgm ON farmer USING gin ((name || ' ' || farm_name || ' ' || email) gin_trgm_ops);
+
 --------------------------------------------------
 -- CUSTOMER
 --------------------------------------------------
@@ -123,6 +129,11 @@ CREATE TABLE customer (
     updated_at          timestamptz NOT NULL DEFAULT now()
 );
 
+CREATE UNIQUE INDEX idx_customer_email_lower ON customer(lower(email));
+CREATE INDEX idx_customer_search_trgm ON customer USING gin ((first_name || ' ' || last_name || ' ' || email) gin_trgm_ops);
+CREATE INDEX idx_customer_created_at ON customer(created_at DESC, id DESC);
+CREATE INDEX idx_customer_marketing_created_at ON customer(marketing_opt_in, created_at DESC, id DESC);
+
 --------------------------------------------------
 -- PRODUCT (belongs to a farmer, with FK to category and unit_label)
 --------------------------------------------------
@@ -152,6 +163,8 @@ CREATE INDEX idx_product_farmer_id ON product(farmer_id);
 CREATE INDEX idx_product_category_id ON product(category_id);
 CREATE INDEX idx_product_unit_label_id ON product(unit_label_id);
 CREATE INDEX idx_product_is_active ON product(is_active);
+CREATE INDEX idx_product_farmer_active ON product(farmer_id, is_active) WHERE is_active;
+CREATE INDEX idx_product_farmer_low_stock ON product(farmer_id) WHERE stock_quantity <= 10;
 
 --------------------------------------------------
 -- ORDERS (linked to farmer + customer)
@@ -188,10 +201,15 @@ CREATE TABLE orders (
     updated_at              timestamptz NOT NULL DEFAULT now()
 );
 
-CREATE INDEX idx_orders_customer_id ON orders(customer_id);
-CREATE INDEX idx_orders_farmer_id   ON orders(farmer_id);
-CREATE INDEX idx_orders_status      ON orders(status);
-CREATE INDEX idx_orders_created_at  ON orders(created_at);
+-- Filter columns first, then the (created_at, id) sort key, so get_orders
+-- reads its page (or seeks to its cursor) in index order
+CREATE INDEX idx_orders_created_at_id              ON orders(created_at DESC, id DESC);
+CREATE INDEX idx_orders_status_created_at          ON orders(status, created_at DESC, id DESC);
+CREATE INDEX idx_orders_payment_status_created_at  ON orders(payment_status, created_at DESC, id DESC);
+CREATE INDEX idx_orders_farmer_created_at          ON orders(farmer_id, created_at DESC, id DESC);
+CREATE INDEX idx_orders_farmer_status_created_at   ON orders(farmer_id, status, created_at DESC, id DESC);
+CREATE INDEX idx_orders_customer_created_at        ON orders(customer_id, created_at DESC, id DESC);
+CREATE INDEX idx_orders_customer_status_created_at ON orders(customer_id, status, created_at DESC, id DESC);
 
 --------------------------------------------------
 -- ORDER_ITEM (individual items within an order)
@@ -241,6 +259,7 @@ CREATE TABLE shipment (
 
 CREATE INDEX idx_shipment_order_id ON shipment(order_id);
 CREATE INDEX idx_shipment_status   ON shipment(status);
+CREATE INDEX idx_shipment_status_order_id ON shipment(status, order_id);
 
 --------------------------------------------------
 -- CUSTOMER SESSION (for Streamlit app)
@@ -271,9 +290,11 @@ CREATE TABLE cart (
     updated_at  timestamptz NOT NULL DEFAULT now()
 );
 
-CREATE INDEX idx_cart_session_id ON cart(session_id);
-CREATE INDEX idx_cart_customer_id ON cart(customer_id);
-CREATE INDEX idx_cart_status ON cart(status);
+-- Each filter column is paired with updated_at so filtered pages come back in list order
+CREATE INDEX idx_cart_session_updated_at  ON cart(session_id, updated_at DESC, id DESC);
+CREATE INDEX idx_cart_customer_updated_at ON cart(customer_id, updated_at DESC, id DESC);
+CREATE INDEX idx_cart_status_updated_at   ON cart(status, updated_at DESC, id DESC);
+CREATE INDEX idx_cart_updated_at          ON cart(updated_at DESC, id DESC);
 
 --------------------------------------------------
 -- CART ITEM (items in shopping cart)
@@ -288,7 +309,7 @@ CREATE TABLE cart_item (
     updated_at  timestamptz NOT NULL DEFAULT now()
 );
 
-CREATE INDEX idx_cart_item_cart_id ON cart_item(cart_id);
 CREATE INDEX idx_cart_item_product_id ON cart_item(product_id);
+CREATE UNIQUE INDEX idx_cart_item_cart_product ON cart_item(cart_id, product_id);
 
 
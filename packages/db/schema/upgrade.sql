@@ -0,0 +1,117 @@
+-- Brings a database created from an older tables.sql up to date.
+--
+-- tables.sql only runs when the Postgres volume is first initialised, so
+-- existing databases need this script for the extension and indexes added
+-- since. Every statement is idempotent; run it with psql outside a
+-- transaction (CONCURRENTLY cannot run inside one):
+--
+--   psql from_field_to_you < packages/db/schema/upgrade.sql
+--
+-- If a CONCURRENTLY build fails it leaves an INVALID index behind, which
+-- IF NOT EXISTS would then skip. Drop that index and run the script again.
+
+\set ON_ERROR_STOP on
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+--------------------------------------------------
+-- CART ITEM: one row per (cart, product)
+--------------------------------------------------
+
+-- Merge duplicate lines into the oldest one before the unique index is built
+WITH ranked AS (
+    SELECT id,
+           first_value(id) OVER w AS keep_id,
+           sum(quantity) OVER (PARTITION BY cart_id, product_id) AS total_quantity,
+           max(updated_at) OVER (PARTITION BY cart_id, product_id) AS last_updated_at,
+           count(*) OVER (PARTITION BY cart_id, product_id) AS copies
+    FROM cart_item
+    WINDOW w AS (PARTITION BY cart_id, product_id ORDER BY created_at, id)
+),
+merged AS (
+    UPDATE cart_item ci
+    SET quantity = r.total_quantity, updated_at = r.last_updated_at
+    FROM ranked r
+    WHERE ci.id = r.id AND r.id = r.keep_id AND r.copies > 1
+)
+DELETE FROM cart_item ci
+USING ranked r
+WHERE ci.id = r.id AND r.id <> r.keep_id;
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_cart_item_cart_product ON cart_item(cart_id, product_id);
+
+--------------------------------------------------
+-- EMAIL: unique regardless of letter case
+--------------------------------------------------
+
+-- Emails differing only in case cannot be merged automatically; stop and list them
+DO $$
+DECLARE
+    duplicates text;
+BEGIN
+    SELECT string_agg(email_key, ', ') INTO duplicates FROM (
+        SELECT 'farmer ' || lower(email) AS email_key FROM farmer GROUP BY lower(email) HAVING count(*) > 1
+        UNION ALL
+        SELECT 'customer ' || lower(email) FROM customer GROUP BY lower(email) HAVING count(*) > 1
+    ) d;
+    IF duplicates IS NOT NULL THEN
+        RAISE EXCEPTION 'Resolve emails that differ only in case before upgrading: %', duplicates;
+    END IF;
+END $$;
+
+-- Replace any earlier non-unique lower(email) index
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+               WHERE c.relname = 'idx_farmer_email_lower' AND NOT i.indisunique) THEN
+        DROP INDEX idx_farmer_email_lower;
+    END IF;
+    IF EXISTS (SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+               WHERE c.relname = 'idx_customer_email_lower' AND NOT i.indisunique) THEN
+        DROP INDEX idx_customer_email_lower;
+    END IF;
+END $$;
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_farmer_email_lower ON farmer(lower(email));
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_customer_email_lower ON customer(lower(email));
+
+--------------------------------------------------
+-- SEARCH AND LIST INDEXES
+--------------------------------------------------
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_farmer_search_trgm ON farmer USING gin ((name || ' ' || farm_name || ' ' || email) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_customer_search_trgm ON customer USING gin ((first_name || ' ' || last_name || ' ' || email) gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_customer_created_at ON customer(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_customer_marketing_created_at ON customer(marketing_opt_in, created_at DESC, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_product_farmer_active ON product(farmer_id, is_active) WHERE is_active;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_product_farmer_low_stock ON product(farmer_id) WHERE stock_quantity <= 10;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_created_at_id              ON orders(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_status_created_at          ON orders(status, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_payment_status_created_at  ON orders(payment_status, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_farmer_created_at          ON orders(farmer_id, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_farmer_status_created_at   ON orders(farmer_id, status, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_customer_created_at        ON orders(customer_id, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_customer_status_created_at ON orders(customer_id, status, created_at DESC, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_shipment_status_order_id ON shipment(status, order_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cart_session_updated_at  ON cart(session_id, updated_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cart_customer_updated_at ON cart(customer_id, updated_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cart_status_updated_at   ON cart(status, updated_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cart_updated_at          ON cart(updated_at DESC, id DESC);
+
+--------------------------------------------------
+-- INDEXES SUPERSEDED BY THE ONES ABOVE
+--------------------------------------------------
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_status;
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_created_at;
+DROP INDEX CONCURRENTLY IF EXISTS idx_cart_session_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_cart_customer_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_cart_status;
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_customer_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_farmer_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_cart_item_cart_id;
@@ -19,6 +19,19 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 DATABASE_SSLMODE = os.getenv("DATABASE_SSLMODE")  # e.g. 'require', 'verify-full'
 DATABASE_ECHO = os.getenv("DATABASE_ECHO", "true").lower() == "true"
 
+# Async connection pool settings
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "20"))
+DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "10"))
+DATABASE_POOL_TIMEOUT = int(os.getenv("DATABASE_POOL_TIMEOUT", "30"))
+DATABASE_POOL_RECYCLE = int(os.getenv("DATABASE_POOL_RECYCLE", "1800"))
+# Compiled statement cache entries per engine (SQLAlchemy's default is 500)
+DATABASE_QUERY_CACHE_SIZE = int(os.getenv("DATABASE_QUERY_CACHE_SIZE", "1200"))
+# Per-connection prepared statement caches (asyncpg's and SQLAlchemy's asyncpg dialect's)
+DATABASE_STATEMENT_CACHE_SIZE = int(os.getenv("DATABASE_STATEMENT_CACHE_SIZE", "1024"))
+DATABASE_PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("DATABASE_PREPARED_STATEMENT_CACHE_SIZE", "512"))
+# Set when connecting through PgBouncer in transaction pooling mode
+DATABASE_PGBOUNCER = os.getenv("DATABASE_PGBOUNCER", "false").lower() == "true"
+
 if not DATABASE_URL:
     raise ValueError(
         "DATABASE_URL environment variable is required. "
@@ -73,10 +86,31 @@ if _is_ssl_required(DATABASE_URL, DATABASE_SSLMODE):
         ssl_context = ssl.create_default_context()
     async_connect_args = {"ssl": ssl_context}
 
+# PgBouncer transaction pooling can hand each transaction a different backend,
+# so asyncpg must not keep prepared statements between them. Otherwise keep
+# enough prepared statements per connection for every distinct query the API
+# issues, so repeat lookups skip Parse/Describe.
+if DATABASE_PGBOUNCER:
+    async_connect_args["statement_cache_size"] = 0
+    async_connect_args["prepared_statement_cache_size"] = 0
+else:
+    # Short OLTP queries never benefit from JIT, so skip its per-query startup
+    # cost. PgBouncer rejects unknown startup parameters, so behind it set
+    # this on the server instead (ALTER DATABASE ... SET jit = off).
+    async_connect_args["server_settings"] = {"jit": "off"}
+    async_connect_args["statement_cache_size"] = DATABASE_STATEMENT_CACHE_SIZE
+    async_connect_args["prepared_statement_cache_size"] = DATABASE_PREPARED_STATEMENT_CACHE_SIZE
+
 async_engine = create_async_engine(
     ASYNC_DATABASE_URL,
     echo=DATABASE_ECHO,
-    connect_args=async_connect_args
+    connect_args=async_connect_args,
+    pool_size=DATABASE_POOL_SIZE,
+    max_overflow=DATABASE_MAX_OVERFLOW,
+    pool_timeout=DATABASE_POOL_TIMEOUT,
+    pool_recycle=DATABASE_POOL_RECYCLE,
+    pool_pre_ping=True,
+    query_cache_size=DATABASE_QUERY_CACHE_SIZE
 )
 
 # Create session makers
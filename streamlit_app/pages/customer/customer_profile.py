@@ -42,7 +42,7 @@ def get_customer_stats(customer_id):
         return {'customer_since': '', 'total_orders': 0, 'total_spent': 0.00}
 
     # Get customer orders
-    orders_response = make_api_request("GET", f"/api/orders/?customer_id={customer_id}")
+    orders_response = make_api_request("GET", f"/api/orders/?customer_id={customer_id}&summary=true")
     orders = orders_response.get('orders', []) if orders_response else []
 
     # Calculate stats
@@ -69,7 +69,7 @@ def get_customer_recent_activity(customer_id, limit=5):
         return []
 
     # Get recent orders as activity
-    orders_response = make_api_request("GET", f"/api/orders/?customer_id={customer_id}&limit={limit}")
+    orders_response = make_api_request("GET", f"/api/orders/?customer_id={customer_id}&limit={limit}&summary=true")
     orders = orders_response.get('orders', []) if orders_response else []
 
     activities = []
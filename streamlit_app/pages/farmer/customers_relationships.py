@@ -17,7 +17,7 @@ def get_customers():
 
 def get_customer_orders(customer_id):
     """Get orders for a specific customer."""
-    response = make_api_request("GET", f"/api/orders/?customer_id={customer_id}")
+    response = make_api_request("GET", f"/api/orders/?customer_id={customer_id}&summary=true")
     return response.get('orders', []) if response else []
 
 def get_farmer_dashboard_stats():